@@ -3,51 +3,109 @@
 # ========================
 #    Librerias
 # ========================
-from numpy.random import choice
+import hashlib
+import os
+from pathlib import Path
+
 import simpy
 import pandas as pd
 import numpy as np
 import random
-from scipy.stats import lognorm
-import scipy.stats as stats
-import matplotlib.pyplot as plt
-import seaborn as sns
 # from prettytable import PrettyTable
 
+try:
+    from joblib import Memory
+except ImportError:  # joblib es opcional: sin él no se guardan resultados
+    Memory = None
+
+try:
+    import python_calamine  # noqa: F401  (motor 'calamine' de pd.read_excel)
+    MOTOR_EXCEL = 'calamine'
+except ImportError:  # python-calamine es opcional: sin él pandas usa openpyxl/xlrd
+    MOTOR_EXCEL = None
+
+import clases_sim_core
+from clases_sim_core import (
+    ParametrosOperacion, Puerto, Bodega, CamionDedicado,
+    generar_buques, iniciar_cola_buques, generar_camiones_puerto,
+    generar_camiones_bodega, monitor_cola_buques,
+)
+# re-exportadas para el código que las importaba desde clases_sim
+from clases_sim_core import Buque, Camion, CamionBodega  # noqa: F401
+
 
 # =======================================
-#    Parámetros básicos de operación
-#       Se pueden modificar
+#    Parámetros de los datos históricos
+#   (los tiempos de operación van en
+#    clases_sim_core.ParametrosOperacion)
 # ========================================
 
-TIEMPO_PUERTA_SALIDA = 8.16        # (minutos)
-TIEMPO_PUERTA_ENTRADA = 2       # (minutos)
-TIEMPO_CARGAR_EN_CHUTE = 7.28     # (minutos)
-TIEMPO_ATRAQUE = 462  # (minutos)
-TIEMPO_LLEGADA_CAMIONES = 440
 TASA_LLEGADA_FACTOR = 1.08
-TIEMPO_A_BODEGA = 3             # (minutos)
-TIEMPO_DESCARGAR_EN_BODEGA = 6  # (minutos)
-TIEMPO_CARGAR_EN_BODEGA = 6     # (minutos)
 
-TIEMPO_ENTRADA_CAMION_DEDICADO = 2  # (minutos)
-TIEMPO_SALIDA_DE_BODEGA = 2         # (minutos)
-MAXIMO_RADA = 8
-TIEMPO_ESPIARSE=2
 
 # =======================================
 #    Datos Historicos Camiones y Buques
 # ========================================
 
-def load_data(camiones_df: pd.DataFrame, buques_df: pd.DataFrame):
-    """Carga los DataFrame y recalcula variables globales."""
+def leer_tabla(ruta) -> pd.DataFrame:
+    """
+    Lee un archivo histórico CSV o Excel. La primera lectura deja una copia
+    .parquet junto al archivo, que se usa mientras el original no cambie.
+    """
+    ruta = Path(ruta)
+    cache = ruta.with_suffix('.parquet')
+    if cache.exists() and cache.stat().st_mtime >= ruta.stat().st_mtime:
+        return pd.read_parquet(cache, engine='pyarrow')
+
+    if ruta.suffix.lower() == '.csv':
+        df = pd.read_csv(ruta)
+    else:
+        df = pd.read_excel(ruta, engine=MOTOR_EXCEL)
+    try:
+        df.to_parquet(cache, engine='pyarrow')
+    except (OSError, TypeError, ValueError):
+        # sin permisos de escritura o columnas no serializables: sin cache
+        pass
+    return df
+
+
+def _firma_df(df: pd.DataFrame):
+    """
+    Huella del contenido de un DataFrame, para detectar datos repetidos.
+    Depende del orden de las filas (load_data usa las últimas) y de los dtypes.
+    """
+    filas = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    return (df.shape, tuple(df.columns), tuple(map(str, df.dtypes)),
+            hashlib.blake2b(filas.tobytes(), digest_size=16).hexdigest())
+
+
+_firma_datos = None
+
+
+def load_data(camiones_df, buques_df):
+    """
+    Carga los DataFrame y recalcula variables globales.
+    Acepta DataFrames o rutas a archivos CSV/Excel (leídos con `leer_tabla`).
+    Si los datos (y TASA_LLEGADA_FACTOR) son los de la última carga, no
+    se recalcula nada.
+    """
     global camiones, buques, tasa_llegada, tasas_llegada, tasa_llegada_buques
+    global _TONELAJE_ARR, _CAPACIDAD_ARR, _firma_datos
+
+    if isinstance(camiones_df, (str, Path)):
+        camiones_df = leer_tabla(camiones_df)
+    if isinstance(buques_df, (str, Path)):
+        buques_df = leer_tabla(buques_df)
 
-    camiones = camiones_df.copy()
-    buques   = buques_df.copy()
+    firma = (_firma_df(camiones_df), _firma_df(buques_df), TASA_LLEGADA_FACTOR)
+    if firma == _firma_datos:
+        return
+
+    camiones = camiones_df
+    buques   = buques_df
     camiones = camiones[camiones['año'] > 2022]
     camiones = camiones[camiones['capacidad'] > 20]
-    tasa_llegada = 1/(camiones.groupby('turno')['min_entre_camiones'].mean())
+    tasa_llegada = 1/(camiones.groupby('turno', observed=True)['min_entre_camiones'].mean())
     tasas_llegada = tasa_llegada.to_dict()
 
     buques = buques[buques['tiempo_descarga'] < 140]
@@ -59,423 +117,172 @@ def load_data(camiones_df: pd.DataFrame, buques_df: pd.DataFrame):
                             buques['primera_espia']).dt.total_seconds()/3600
     buques['minutos_delay'] = buques['horas_delay']*60
     buques['dias_delay'] = buques['horas_delay']/24
-    buques = buques[-250:]
-    buques['horas_de_espera'] = buques['tiempo_de_espera'].copy()
-    buques['horas_de_descarga'] = buques['tiempo_descarga'].copy()
-    buques['horas_detencion'] = buques['total_detenciones'].copy()
-    buques['horas_entre_arribos'] = buques['tiempo_entre_arribos'].copy()
-    buques['horas_falta_equipos'] = buques['total_falta_equipos'].copy()
-    buques['Dias_de_espera_buque'] = buques['tiempo_de_espera']/24
-    buques['Dias_de_descarga_buque'] = buques['tiempo_descarga']/24
-    buques['Dias_detencion_buque'] = buques['total_detenciones']/24
-    buques['Dias_entre_arribos_buque'] = buques['tiempo_entre_arribos']/24
-    buques['Dias_falta_equipos_buque'] = buques['total_falta_equipos']/24
+    buques = buques[-250:].copy()
+
+    # Conversiones de unidades en bloque: una matriz (n, 5) en horas
+    m_horas = buques[['tiempo_de_espera', 'tiempo_descarga', 'total_detenciones',
+                      'tiempo_entre_arribos', 'total_falta_equipos']].to_numpy(dtype=float)
+    buques[['horas_de_espera', 'horas_de_descarga', 'horas_detencion',
+            'horas_entre_arribos', 'horas_falta_equipos']] = m_horas
+    buques[['Dias_de_espera_buque', 'Dias_de_descarga_buque', 'Dias_detencion_buque',
+            'Dias_entre_arribos_buque', 'Dias_falta_equipos_buque']] = m_horas/24
     buques['Dias_espera_2'] = buques['espera_sin_detenciones_externas']/24
-    buques['tiempo_de_espera'] = buques['tiempo_de_espera']*60
-    buques['tiempo_descarga'] = buques['tiempo_descarga']*60
-    buques['total_detenciones'] = buques['total_detenciones']*60
-    buques['minutos_entre_arribos'] = buques['tiempo_entre_arribos']*60
-    buques['total_falta_equipos'] = buques['total_falta_equipos']*60
-
+    buques[['tiempo_de_espera', 'tiempo_descarga', 'total_detenciones',
+            'minutos_entre_arribos', 'total_falta_equipos']] = m_horas*60
 
     tasa_llegada_buques = 1/(buques['minutos_entre_arribos'].mean())
 
     tasa_llegada_buques = tasa_llegada_buques*TASA_LLEGADA_FACTOR  # tasa
-    camiones = camiones[camiones['año'] > 2022]
-    camiones = camiones[camiones['capacidad'] > 20]
-    tasa_llegada = 1/(camiones.groupby('turno')['min_entre_camiones'].mean())
-    tasas_llegada = tasa_llegada.to_dict()
-
 
     buques = buques[buques['dias_delay'] > 0]
     buques = buques[buques['dias_delay'] < 0.5]
 
-
-def determinar_turno(hora):
-    if 8 <= hora < 16:
-        return 1
-    elif 16 <= hora < 24:
-        return 2
-    else:
-        return 3
-
+    # Columnas muestreadas en cada arribo, extraidas una sola vez como ndarray
+    _TONELAJE_ARR = buques['tonelaje'].to_numpy()
+    _CAPACIDAD_ARR = camiones['capacidad'].to_numpy()
+    _firma_datos = firma
 
 
 # =====================================
-#   Clases
+#   Muestreo aleatorio por lotes
 # =====================================
 
-class Puerto:
-    def __init__(self, env):
-        self.env = env
-        self.frente_atraque = simpy.Resource(env, capacity=1)
-        self.puerta_entrada = simpy.Resource(env, capacity=1)
-        self.puerta_salida = simpy.Resource(env, capacity=1)
-        self.chutes = simpy.Resource(env, capacity=5)
-        self.grano_muelle = simpy.Container(env, init=0)
-        self.iniciar_llegada_camiones = env.event()
-        self.inicio_descarga_evento = env.event()
-        self.fin_descarga_evento = env.event()
-        self.falta_camiones_event = env.event()
-        self.buques_peridos = 0
-        self.current_buque = None
-        self.arribo_buque_evento = env.event()
-        self.buques_atendidos = []
-        self.datos_rada = []
-
-    def monitor_cola_camiones(self, env: simpy.Environment):
-        """
-        Monitorea la cola de camiones en la puerta de entrada.
-        Si no hay camiones, dispara un evento indicando falta de camiones.
-        """
-        while True:
-            if len(self.puerta_entrada.users) == 0 and len(self.puerta_entrada.queue) == 0:
-                self.falta_camiones_event.succeed()
-                self.falta_camiones_event = env.event()
-            yield env.timeout(0.5)
-
-
-class Bodega:
-    def __init__(self, env, grano_bodega_init):
-        self.env = env
-        self.grano_bodega = simpy.Container(env, init=grano_bodega_init)
-        self.cargar_en_bodega = simpy.Resource(env, capacity=1)
-        self.descargar_en_bodega = simpy.Resource(env, capacity=1)
-        self.bodega_recargada = env.event()
-        self.eventos_bodega = []
-        if grano_bodega_init > 0:
-            self.bodega_recargada.succeed()
-            self.bodega_recargada = env.event()
-
-
-class Buque:
-    def __init__(self, env, puerto: Puerto, id_buque, tonelaje):
-        self.env = env
-        self.id_buque = id_buque
-        self.tonelaje = tonelaje
-        self.puerto = puerto
-        self.num_camiones_normales = 0
-        self.num_camiones_dedicados = 0
-        self.largo_cola_al_arribar = len(puerto.frente_atraque.queue)
-
-    def proceso_buque(self, env, puerto):
-        """
-        Proceso que maneja la llegada de un buque, el atraque,
-        la espera y la descarga.
-        """
-        self.arribo = env.now
-        with puerto.frente_atraque.request() as request_muelle:
-            yield request_muelle
-
-            yield env.timeout(TIEMPO_LLEGADA_CAMIONES)
-
-            puerto.current_buque = self
-
-            # Iniciar la llegada de camiones:
-            puerto.iniciar_llegada_camiones.succeed()
-            puerto.iniciar_llegada_camiones = env.event()
-
-            yield env.timeout(TIEMPO_ATRAQUE-TIEMPO_LLEGADA_CAMIONES)
-            # fin de atraque, comienza descarga
-
-            self.primera_espia = env.now
-            self.tiempo_espera = self.primera_espia - self.arribo
-            yield env.timeout(TIEMPO_ESPIARSE)
-
-            # yield env.timeout(choice(buques['minutos_delay'].values))
-
-            # Cargar el grano en el muelle
-            yield puerto.grano_muelle.put(self.tonelaje)
-
-            puerto.inicio_descarga_evento.succeed()
-            puerto.inicio_descarga_evento = env.event()
-            self.inicio_descarga = env.now
-            # Esperar a que se dispare el evento de fin de descarga
-            yield puerto.fin_descarga_evento
-            puerto.current_buque = None
-            self.tiempo_descarga = env.now - self.inicio_descarga
-
-            puerto.buques_atendidos.append(self)
-
-
-class Camion:
-    def __init__(self, env, id_camion, capacidad, puerto: Puerto):
-        self.env = env
-        self.id = id_camion
-        self.capacidad = capacidad
-        self.carga = 0
-        self.puerto = puerto
-        self.proceso = env.process(self.proceso_camion(env, puerto))
-
-    def proceso_camion(self, env,  puerto: Puerto):
-        """
-        Proceso del camión normal que entra por la puerta,
-        solicita chute y carga desde el muelle, luego sale por la puerta de salida.
-        """
-        req_puerta_entrada = puerto.puerta_entrada.request()
-        yield req_puerta_entrada
-        yield env.timeout(TIEMPO_PUERTA_ENTRADA/2)
-        with puerto.chutes.request() as req_chute:
-            yield req_chute
-            yield env.timeout(TIEMPO_PUERTA_ENTRADA/2)
-
-            puerto.puerta_entrada.release(req_puerta_entrada)
-
-            # Verificación de pausa en caso de horario de colación (ejemplo simple)
-            current_time = env.now % 1440
-            if 780 <= current_time < 840:
-                yield env.timeout(840 - current_time)
-            elif 420 <= current_time < 480:
-                yield env.timeout(480 - current_time)
-            elif 900 <= current_time < 960:
-                yield env.timeout(960 - current_time)
-            elif 1380 <= current_time < 1440:
-                yield env.timeout(1440 - current_time)
-
-            # Esperar a que comience la descarga si no hay buque o no hay grano
-            if puerto.grano_muelle.level == 0 or puerto.current_buque == None:
-                yield puerto.inicio_descarga_evento
-
-            # Carga mínima entre la capacidad del camión y lo disponible en muelle
-            carga = min(self.capacidad,  puerto.grano_muelle.level)
-            yield puerto.grano_muelle.get(carga)
-            self.carga = carga
-            puerto.current_buque.num_camiones_normales += 1
-
-            # Si ya no queda grano y todavía está en curso la descarga del buque,
-            # se dispara el evento fin de descarga
-            if puerto.grano_muelle.level == 0 and not puerto.fin_descarga_evento.triggered:
-                puerto.fin_descarga_evento.succeed()
-                puerto.fin_descarga_evento = env.event()
-
-            yield env.timeout(TIEMPO_CARGAR_EN_CHUTE)
-        req_puerta_salida = puerto.puerta_salida.request()
-        yield req_puerta_salida
-        # Tiempo de salida del puerto
-        yield env.timeout(TIEMPO_PUERTA_SALIDA)
-        puerto.puerta_salida.release(req_puerta_salida)
-
-
-class CamionDedicado:
-    def __init__(self, env, id_camion, capacidad, puerto: Puerto, bodega: Bodega):
-        self.env = env
-        self.id = id_camion
-        self.capacidad = capacidad
-        self.puerto = puerto
-        self.bodega = bodega
-        self.carga = 0
-        self.proceso = env.process(
-            self.proceso_camion_dedicado(env, puerto, bodega))
-
-    def proceso_camion_dedicado(self, env, puerto, bodega):
-        """
-        El camión dedicado viaja repetidamente entre el muelle y la bodega.
-        Solo parte cuando no hay camiones normales disponibles y se requiere traslado.
-        """
-        while True:
-            # Esperar hasta que se dispare el evento de falta de camiones
-            esperar = True
-            while esperar:
-                yield puerto.falta_camiones_event
-                yield env.timeout(2)
-                if len(puerto.puerta_entrada.users) == 0 and len(puerto.puerta_entrada.queue) == 0:
-                    esperar = False
-
-            # Entra al muelle
-            req_puerta = puerto.puerta_entrada.request()
-            yield req_puerta
-
-            # Tiempo de entrada exclusivo para camiones dedicados
-            yield env.timeout(TIEMPO_ENTRADA_CAMION_DEDICADO)
-
-            with puerto.chutes.request() as req_chute:
-                yield req_chute
-
-                puerto.puerta_entrada.release(req_puerta)
-
-                current_time = env.now % 1440
-                if 780 <= current_time < 840:
-                    yield env.timeout(840 - current_time)
-                elif 420 <= current_time < 480:
-                    yield env.timeout(480 - current_time)
-                elif 900 <= current_time < 960:
-                    yield env.timeout(960 - current_time)
-                elif 1380 <= current_time < 1440:
-                    yield env.timeout(1440 - current_time)
-
-                # Si no hay grano o no hay buque, esperar el inicio de descarga
-                if puerto.grano_muelle.level == 0 or puerto.current_buque == None:
-                    yield puerto.inicio_descarga_evento
-
-                carga = min(self.capacidad,  puerto.grano_muelle.level)
-                yield puerto.grano_muelle.get(carga)
-                self.carga = carga
-                puerto.current_buque.num_camiones_dedicados += 1
-
-                if puerto.grano_muelle.level == 0 and not puerto.fin_descarga_evento.triggered:
-                    puerto.fin_descarga_evento.succeed()
-                    puerto.fin_descarga_evento = env.event()
-
-                yield env.timeout(TIEMPO_CARGAR_EN_CHUTE)
-
-            # Traslado a la bodega
-            yield env.timeout(TIEMPO_A_BODEGA)
-
-            # Descarga en la bodega
-            self.t_llegada_bodega = env.now
-            with bodega.descargar_en_bodega.request() as req_bodega:
-                yield req_bodega
-                self.t_inicio_descarga_bodega = env.now
-
-                yield env.timeout(TIEMPO_DESCARGAR_EN_BODEGA)
-                yield bodega.grano_bodega.put(self.carga)
-                if not bodega.bodega_recargada.triggered:
-                    bodega.bodega_recargada.succeed()
-                    bodega.bodega_recargada = env.event()
-
-                self.carga_depositada = self.carga
-                self.carga = 0
-                self.fin_descarga = env.now
-
-                self.tiempo_en_cola = self.t_inicio_descarga_bodega-self.t_llegada_bodega
-                self.tiempo_descarga = self.fin_descarga-self.t_inicio_descarga_bodega
-
-                bodega.eventos_bodega.append({
-                    'id_camion': 'Dedicado'+str(self.id),
-                    'horas en cola bodega': self.tiempo_en_cola/60,
-                    'horas de descarga en bodega': self.tiempo_descarga/60,
-                    'horas de carga en bodega': 0,
-                    'actividad camion ': 'descargar en bodega',
-                    'tons depositadas en bodega': self.carga_depositada,
-                    'tons retiradas de bodega': 0,
-                    'ton restante bodega': bodega.grano_bodega.level
-                })
-
-            yield env.timeout(TIEMPO_SALIDA_DE_BODEGA)
-
-
-class CamionBodega:
-    def __init__(self, env, id_camion_bodega, capacidad, bodega):
-        self.env = env
-        self.id = id_camion_bodega
-        self.capacidad = capacidad
-        self.carga = 0
-        self.proceso = env.process(self.proceso_camion_bodega(env, bodega))
-
-    def proceso_camion_bodega(self, env, bodega: Bodega):
-        """
-        Camión que se carga en la bodega y luego sale.
-        """
-        self.tiempo_llegada = env.now
-        with bodega.cargar_en_bodega.request() as req_cargar_bodega:
-            yield req_cargar_bodega
-            self.inicio_carga = env.now
-
-            # Espera si la bodega está vacía
-            if bodega.grano_bodega.level == 0:
-                yield bodega.bodega_recargada
-
-            yield env.timeout(TIEMPO_CARGAR_EN_BODEGA)
-
-            carga = min(self.capacidad,  bodega.grano_bodega.level)
-            yield bodega.grano_bodega.get(carga)
-            self.carga = carga
-            self.fin_carga = env.now
-
-            self.tiempo_en_cola = self.inicio_carga-self.tiempo_llegada
-            self.tiempo_carga = self.fin_carga-self.inicio_carga
-
-            bodega.eventos_bodega.append({
-                'id_camion': 'Bodega'+str(self.id),
-                'horas en cola bodega': self.tiempo_en_cola/60,
-                'horas de descarga en bodega': 0,
-                'horas de carga en bodega': self.tiempo_carga/60,
-                'actividad camion ': 'cargar en bodega',
-                'tons depositadas en bodega': 0,
-                'tons retiradas de bodega': self.carga,
-                'ton restante bodega': bodega.grano_bodega.level
-            })
-
-            yield env.timeout(TIEMPO_SALIDA_DE_BODEGA)
-
-def generar_buques(env: simpy.Environment, puerto: Puerto):
+TAMANO_LOTE = 4096
+
+
+def _exp_iter(tasa, B=TAMANO_LOTE):
     """
-    Genera buques en el sistema basados en una tasa de llegada exponencial.
+    Entrega tiempos exponenciales de tasa `tasa`, muestreados en lotes de B
+    con NumPy y consumidos uno a uno desde el generador.
     """
-    i_buques = 0
+    escala = 1/tasa
     while True:
-        tiempo_entre_arribo = random.expovariate(tasa_llegada_buques)
-        yield env.timeout(tiempo_entre_arribo)
+        yield from np.random.exponential(escala, size=B).tolist()
 
-        # Si la cola es muy larga, se asume que el buque se pierde
-        if len(puerto.frente_atraque.queue) < MAXIMO_RADA:
-            buque = Buque(env, puerto, i_buques, choice(buques['tonelaje']))
-            env.process(buque.proceso_buque(env, puerto))
-            i_buques += 1
-        else:
-            puerto.buques_peridos += 1
 
-
-def generar_camiones_puerto(env, puerto, p):
+def _choice_iter(arr, B=TAMANO_LOTE):
     """
-    Genera camiones normales que llegan al puerto para cargar. 
-    La probabilidad `p` se utiliza para otras condiciones (ej: ir a bodega).
+    Entrega elementos de `arr` elegidos al azar (con reemplazo),
+    muestreados en lotes de B.
     """
-    camion_puerto_id = 0
+    n = len(arr)
     while True:
-        yield puerto.iniciar_llegada_camiones
+        yield from arr[np.random.randint(n, size=B)].tolist()
 
-        while puerto.current_buque is not None:
-            hora = (env.now % 1440) // 60
-            turno = determinar_turno(hora)
-            if random.random() < 1-p:
-                yield env.timeout(random.expovariate(tasa_llegada[turno]))
 
-            # Ejemplo de uso de p (no se emplea aquí, pero se deja para posibles extensiones)
-                Camion(env, camion_puerto_id, choice(
-                    camiones['capacidad']), puerto)
-                camion_puerto_id += 1
+def _bernoulli_iter(p, B=TAMANO_LOTE):
+    """
+    Entrega ensayos de Bernoulli (True con probabilidad `p`),
+    muestreados en lotes de B.
+    """
+    while True:
+        yield from (np.random.random(B) < p).tolist()
 
 
-def generar_camiones_bodega(env, bodega, p):
+def _iniciar_muestreo():
     """
-    Genera camiones que se cargan en la bodega. 
-    La probabilidad `p` indica la probabilidad de que se generen estos camiones.
+    Crea los iteradores de muestreo de la corrida. Se llama despues de fijar
+    la semilla para que los lotes sean reproducibles.
     """
-    camion_bodega_id = 0
-    while True:
-        # Espera hasta que la bodega tenga algo de grano
-        yield bodega.bodega_recargada
+    global _exp_iters, _exp_iter_buques, _cap_iter, _tonelaje_iter
+
+    _exp_iters = {turno: _exp_iter(tasa) for turno, tasa in tasas_llegada.items()}
+    _exp_iter_buques = _exp_iter(tasa_llegada_buques)
+    _cap_iter = _choice_iter(_CAPACIDAD_ARR)
+    _tonelaje_iter = _choice_iter(_TONELAJE_ARR)
 
-        while bodega.grano_bodega.level > 0:
-            hora = (env.now % 1440) // 60
-            turno = determinar_turno(hora)
-            if random.random() < p:
-                yield env.timeout(random.expovariate(tasa_llegada[turno]))
 
-                CamionBodega(env, camion_bodega_id, choice(
-                    camiones['capacidad']), bodega)
-                camion_bodega_id += 1
 
+# =====================================
+#   Cache de resultados en disco
+# =====================================
 
-def monitor_cola_buques(env, puerto: Puerto):
+# La variable de entorno SIM_PUERTO_CACHE cambia el directorio; vacía o "0" desactiva el cache
+_ENTORNO_CACHE = os.environ.get('SIM_PUERTO_CACHE')
+if _ENTORNO_CACHE is None:
+    DIRECTORIO_CACHE = Path(__file__).with_name('sim_cache')
+elif _ENTORNO_CACHE in ('', '0'):
+    DIRECTORIO_CACHE = None
+else:
+    DIRECTORIO_CACHE = Path(_ENTORNO_CACHE)
+# Tamaño máximo del cache: al guardar una corrida nueva se borran las de uso más antiguo
+LIMITE_CACHE = '256M'
+# Código de la simulación y de la construcción de los DataFrame de resultados
+_FIRMA_CODIGO = hashlib.sha1(Path(clases_sim_core.__file__).read_bytes()
+                             + Path(__file__).read_bytes()).hexdigest()
+
+
+def _firma_parametros():
     """
-    Monitorea la cola de buques en el muelle y guarda datos en puerto.datos_rada.
+    Todo lo que, además de los argumentos, determina el resultado de una
+    corrida: la firma de los datos cargados (que incluye TASA_LLEGADA_FACTOR)
+    y el código de clases_sim_core y de este módulo. Los tiempos de operación
+    llegan como argumento (`parametros`).
     """
-    while True:
-        yield env.timeout(60*24)
-        tiempo = env.now
-        buques_en_cola = len(puerto.frente_atraque.queue) + \
-            len(puerto.frente_atraque.users)
-        puerto.datos_rada.append({
-            'Dia': tiempo // 1440,
-            'Largo cola rada': buques_en_cola,
-            'total buques atendidos': len(puerto.buques_atendidos),
-            'total buques perdidos': puerto.buques_peridos
-        })
+    return _firma_datos, _FIRMA_CODIGO
+
+
+def simulacion(años, camiones_dedicados=0, grano=0, cap=0, prob=0, buques_inicio_cola=7, seed=None,
+               parametros=None, progress_cb=None, usar_cache=True):
+    """
+    Ejecuta la simulación, reutilizando el resultado guardado en
+    `DIRECTORIO_CACHE` si ya se corrió con los mismos argumentos, datos y
+    tiempos de operación. Solo se guardan corridas con `seed` fija (y un
+    resultado guardado no llama a `progress_cb`), hasta LIMITE_CACHE;
+    `usar_cache=False` corre siempre la simulación sin leer ni guardar nada.
+    Los demás parámetros y el retorno son los de `_simular`.
+    """
+    if parametros is None:
+        parametros = ParametrosOperacion()
+    en_cache = _cache_simulacion() if usar_cache and seed is not None else None
+    if en_cache is None:
+        return _simular(años, camiones_dedicados, grano, cap, prob, buques_inicio_cola, seed,
+                        parametros, progress_cb)
+    args = (años, camiones_dedicados, grano, cap, prob, buques_inicio_cola, seed,
+            parametros, _firma_parametros())
+    if en_cache.check_call_in_cache(*args):
+        return en_cache(*args)
+    resultado = en_cache(*args, progress_cb)
+    _memoria.reduce_size(bytes_limit=LIMITE_CACHE)
+    return resultado
+
+
+_memoria = None
+_simular_en_cache = None
+
+
+def _cache_simulacion():
+    """
+    Versión de `_simular_con_firma` guardada en disco, creada en la primera
+    corrida con semilla (importar el módulo no crea DIRECTORIO_CACHE).
+    None si falta joblib, el cache está desactivado o no se puede escribir.
+    """
+    global _memoria, _simular_en_cache
+    if _simular_en_cache is None and Memory is not None and DIRECTORIO_CACHE is not None:
+        try:
+            DIRECTORIO_CACHE.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return None
+        if not os.access(DIRECTORIO_CACHE, os.W_OK):
+            return None
+        _memoria = Memory(DIRECTORIO_CACHE, verbose=0)
+        _simular_en_cache = _memoria.cache(_simular_con_firma, ignore=['progress_cb'])
+    return _simular_en_cache
+
+
+def _simular_con_firma(años, camiones_dedicados, grano, cap, prob, buques_inicio_cola, seed,
+                       parametros, firma, progress_cb=None):
+    # `firma` no se usa: solo forma parte de la clave del cache
+    return _simular(años, camiones_dedicados, grano, cap, prob, buques_inicio_cola, seed,
+                    parametros, progress_cb)
+
 
+# Cuántas veces se avisa el avance de una corrida a `progress_cb`
+PASOS_AVANCE = 10
 
-def simulacion(años, camiones_dedicados=0, grano=0, cap=0, prob=0, buques_inicio_cola=7, seed=None):
+
+def _simular(años, camiones_dedicados=0, grano=0, cap=0, prob=0, buques_inicio_cola=7, seed=None,
+             parametros=None, progress_cb=None):
     """
     Ejecuta la simulación con los parámetros proporcionados:
     - tiempo: tiempo total de simulación (minutos)
@@ -484,6 +291,10 @@ def simulacion(años, camiones_dedicados=0, grano=0, cap=0, prob=0, buques_inici
     - cap: capacidad de camiones dedicados
     - prob: probabilidad asociada a la generación de camiones para la bodega
     - buques_inicio_cola: cuántos buques se inician en la cola (inicial)
+    - parametros: ParametrosOperacion con los tiempos de operación
+      (por defecto, las constantes de clases_sim_core)
+    - progress_cb: función opcional progress_cb(avance, mensaje), con avance
+      entre 0 y 1, llamada PASOS_AVANCE veces a medida que avanza el reloj
 
     Retorna:
     - df_buques: DataFrame con info de buques atendidos
@@ -495,55 +306,80 @@ def simulacion(años, camiones_dedicados=0, grano=0, cap=0, prob=0, buques_inici
     if seed is not None:
         random.seed(seed)
         np.random.seed(seed)
+    _iniciar_muestreo()
 
     env = simpy.Environment()
-    puerto = Puerto(env)
+    # el tonelaje conserva el dtype de los datos (enteros como int64)
+    puerto = Puerto(env, parametros, 'q' if _TONELAJE_ARR.dtype.kind in 'iu' else 'd')
 
-    env.process(generar_buques(env, puerto))
-    env.process(generar_camiones_puerto(env, puerto, prob))
+    env.process(generar_buques(env, puerto, _exp_iter_buques, _tonelaje_iter))
+    env.process(generar_camiones_puerto(
+        env, puerto, _bernoulli_iter(1-prob), _exp_iters, _cap_iter))
     env.process(monitor_cola_buques(env, puerto))
 
-    for i in range(buques_inicio_cola):
-        buque = Buque(env, puerto, i, choice(buques['tonelaje']))
-        env.process(buque.proceso_buque(env, puerto))
+    tonelajes_iniciales = [next(_tonelaje_iter) for _ in range(buques_inicio_cola)]
+    env.process(iniciar_cola_buques(env, puerto, tonelajes_iniciales))
 
     if camiones_dedicados > 0:
-        bodega = Bodega(env, grano)
-        env.process(generar_camiones_bodega(env, bodega, prob))
-        env.process(puerto.monitor_cola_camiones(env))
+        bodega = Bodega(env, grano, parametros)
+        env.process(generar_camiones_bodega(
+            env, bodega, _bernoulli_iter(prob), _exp_iters, _cap_iter))
 
         for i in range(camiones_dedicados):
             CamionDedicado(env, i, cap, puerto, bodega)
 
-    env.run(until=tiempo)
-
-    datos_buques = []
-    for buque in puerto.buques_atendidos[buques_inicio_cola:]:
-        datos_buques.append({
-            'BuqueID': buque.id_buque,
-            'Largo cola al arribo': buque.largo_cola_al_arribar,
-            'Tonelaje buque': buque.tonelaje,
-            'Arribo': buque.arribo,
-            'Tiempo de espera (dias)': (buque.tiempo_espera)/(60*24),
-            'Tiempo descarga (dias)': buque.tiempo_descarga/(60*24),
-            'Camiones normales': buque.num_camiones_normales,
-            'Camiones dedicados': buque.num_camiones_dedicados,
-            'Tiempo de espera (horas)': buque.tiempo_espera/60,
-            'Tiempo descarga (horas)': buque.tiempo_descarga/60
-
-        })
-
-    df_buques = pd.DataFrame(datos_buques)
-    df_cola = pd.DataFrame(puerto.datos_rada)
+    if progress_cb is None:
+        env.run(until=tiempo)
+    else:
+        # mismo resultado que una sola corrida: env.run solo se detiene en el tiempo pedido
+        dias = round(tiempo/(60*24))
+        for paso in range(1, PASOS_AVANCE + 1):
+            env.run(until=tiempo*paso/PASOS_AVANCE if paso < PASOS_AVANCE else tiempo)
+            progress_cb(paso/PASOS_AVANCE, f"Simulando día {round(env.now/(60*24))} de {dias}")
+
+    # Se descartan los buques que iniciaron la simulación en cola
+    atendidos = {nombre: np.asarray(col)[buques_inicio_cola:]
+                 for nombre, col in puerto.buques_atendidos.columnas.items()}
+    espera = atendidos['tiempo_espera']
+    descarga = atendidos['tiempo_descarga']
+    df_buques = pd.DataFrame({
+        'BuqueID': atendidos['id_buque'],
+        'Largo cola al arribo': atendidos['largo_cola_al_arribar'],
+        'Tonelaje buque': atendidos['tonelaje'],
+        'Arribo': atendidos['arribo'],
+        'Tiempo de espera (dias)': espera/(60*24),
+        'Tiempo descarga (dias)': descarga/(60*24),
+        'Camiones normales': atendidos['num_camiones_normales'],
+        'Camiones dedicados': atendidos['num_camiones_dedicados'],
+        'Tiempo de espera (horas)': espera/60,
+        'Tiempo descarga (horas)': descarga/60
+    })
+    rada = puerto.rada
+    df_cola = pd.DataFrame({
+        'Dia': np.asarray(rada['dia']),
+        'Largo cola rada': np.asarray(rada['largo_cola']),
+        'total buques atendidos': np.asarray(rada['atendidos']),
+        'total buques perdidos': np.asarray(rada['perdidos'])
+    })
     if camiones_dedicados > 0:
-        df_bodega = pd.DataFrame(bodega.eventos_bodega)
+        eventos = {nombre: np.asarray(col)
+                   for nombre, col in bodega.eventos_bodega.columnas.items()}
+        cargar = eventos['tipo'] == 1
+        df_bodega = pd.DataFrame({
+            'id_camion': np.char.add(np.where(cargar, 'Bodega', 'Dedicado'),
+                                     eventos['id_camion'].astype(str)).astype(object),
+            'horas en cola bodega': eventos['horas en cola bodega'],
+            'horas de descarga en bodega': eventos['horas de descarga en bodega'],
+            'horas de carga en bodega': eventos['horas de carga en bodega'],
+            # categórica: los filtros por actividad comparan códigos, no strings
+            'actividad camion ': pd.Categorical.from_codes(
+                cargar.astype(np.int8), ['descargar en bodega', 'cargar en bodega']),
+            'tons depositadas en bodega': eventos['tons depositadas en bodega'],
+            'tons retiradas de bodega': eventos['tons retiradas de bodega'],
+            'ton restante bodega': eventos['ton restante bodega']
+        })
         return df_buques, df_cola, df_bodega
     
     print('fin simulacion')
 
     return df_buques, df_cola
-
-
-
-
-
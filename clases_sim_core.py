@@ -0,0 +1,615 @@
+"""
+Núcleo de la simulación: recursos, entidades y procesos de SimPy.
+
+Solo depende de la biblioteca estándar y de `simpy`, para que el ciclo de
+eventos no pase por pandas/numpy y el módulo pueda correr también en PyPy.
+Los valores aleatorios llegan como iteradores desde `clases_sim`.
+"""
+# ========================
+#    Librerias
+# ========================
+from array import array
+from dataclasses import dataclass
+
+import simpy
+
+
+# =======================================
+#    Parámetros básicos de operación
+#       Se pueden modificar
+# ========================================
+
+TIEMPO_PUERTA_SALIDA = 8.16        # (minutos)
+TIEMPO_PUERTA_ENTRADA = 2       # (minutos)
+TIEMPO_CARGAR_EN_CHUTE = 7.28     # (minutos)
+TIEMPO_ATRAQUE = 462  # (minutos)
+TIEMPO_LLEGADA_CAMIONES = 440
+TIEMPO_A_BODEGA = 3             # (minutos)
+TIEMPO_DESCARGAR_EN_BODEGA = 6  # (minutos)
+TIEMPO_CARGAR_EN_BODEGA = 6     # (minutos)
+
+TIEMPO_ENTRADA_CAMION_DEDICADO = 2  # (minutos)
+TIEMPO_SALIDA_DE_BODEGA = 2         # (minutos)
+MAXIMO_RADA = 8
+TIEMPO_ESPIARSE=2
+
+# Los avisos de falta de camiones caen en múltiplos de este paso (minutos),
+# como con el monitoreo periódico de la puerta que reemplazan. En un tick,
+# el monitoreo corría después de los procesos que despiertan por un timeout
+# y antes de los eventos encadenados en ese mismo instante (p. ej. un chute
+# asignado en el acto): quien libera o consulta la puerta indica cuál es su
+# caso con `en_este_tick`.
+PASO_MONITOR_PUERTA = 0.5
+
+
+@dataclass(frozen=True, slots=True)
+class ParametrosOperacion:
+    """
+    Tiempos de operación (minutos) y largo máximo de la rada de una corrida.
+    Por defecto toma las constantes de arriba. Cada proceso copia a variables
+    locales los valores que usa al comenzar.
+    """
+    tiempo_puerta_salida: float = TIEMPO_PUERTA_SALIDA
+    tiempo_puerta_entrada: float = TIEMPO_PUERTA_ENTRADA
+    tiempo_cargar_en_chute: float = TIEMPO_CARGAR_EN_CHUTE
+    tiempo_atraque: float = TIEMPO_ATRAQUE
+    tiempo_llegada_camiones: float = TIEMPO_LLEGADA_CAMIONES
+    tiempo_a_bodega: float = TIEMPO_A_BODEGA
+    tiempo_descargar_en_bodega: float = TIEMPO_DESCARGAR_EN_BODEGA
+    tiempo_cargar_en_bodega: float = TIEMPO_CARGAR_EN_BODEGA
+    tiempo_entrada_camion_dedicado: float = TIEMPO_ENTRADA_CAMION_DEDICADO
+    tiempo_salida_de_bodega: float = TIEMPO_SALIDA_DE_BODEGA
+    maximo_rada: int = MAXIMO_RADA
+    tiempo_espiarse: float = TIEMPO_ESPIARSE
+
+# Horarios de colación (minuto del día): (inicio, fin)
+HORARIOS_COLACION = ((420, 480), (780, 840), (900, 960), (1380, 1440))
+
+
+def determinar_turno(hora):
+    if 8 <= hora < 16:
+        return 1
+    elif 16 <= hora < 24:
+        return 2
+    else:
+        return 3
+
+
+def _espera_colacion(minuto_dia):
+    """
+    Minutos que faltan para terminar la colación en curso, o 0 si
+    `minuto_dia` no cae en ningún horario de colación.
+    """
+    for inicio, fin in HORARIOS_COLACION:
+        if inicio <= minuto_dia < fin:
+            return fin - minuto_dia
+    return 0
+
+
+# =====================================
+#   Clases
+# =====================================
+
+class RegistroColumnar:
+    """
+    Registro en formato de columnas (struct-of-arrays): un `array.array`
+    por campo, con su código de tipo ('q' entero, 'd' real, 'b' byte...).
+    Las columnas exponen el protocolo de buffer, así que `np.asarray`
+    las convierte sin copiar elemento a elemento.
+    """
+    def __init__(self, campos):
+        self.n = 0
+        self.columnas = {nombre: array(codigo) for nombre, codigo in campos.items()}
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, nombre):
+        return self.columnas[nombre]
+
+    def agregar(self, *valores):
+        for col, valor in zip(self.columnas.values(), valores):
+            col.append(valor)
+        self.n += 1
+
+
+class EventoDifusion:
+    """
+    Señal que despierta a todos los procesos que la esperan.
+    Los procesos esperan con `yield senal.esperar()` y `disparar()` los
+    despierta. Si nadie está esperando, disparar no hace nada y se conserva
+    el mismo evento pendiente, en vez de crear uno nuevo en cada aviso.
+    """
+    __slots__ = ('env', '_evento')
+
+    def __init__(self, env):
+        self.env = env
+        self._evento = env.event()
+
+    def esperar(self):
+        return self._evento
+
+    @property
+    def esperando(self):
+        return bool(self._evento.callbacks)
+
+    def disparar(self):
+        if self._evento.callbacks:
+            self._evento.succeed()
+            self._evento = self.env.event()
+
+
+def _hasta_el_tick(ahora, en_este_tick):
+    """
+    Minutos desde `ahora` hasta el tick del monitoreo de la puerta que lo
+    ve: 0 si `ahora` es un tick y `en_este_tick`, si no el tick siguiente.
+    """
+    if en_este_tick and ahora % PASO_MONITOR_PUERTA == 0:
+        return 0
+    return (ahora // PASO_MONITOR_PUERTA + 1) * PASO_MONITOR_PUERTA - ahora
+
+
+class PuertaEntrada(simpy.Resource):
+    """
+    Puerta de entrada que llama a `al_quedar_libre(en_este_tick)` cuando una
+    liberación la deja sin camiones usándola ni esperando.
+    """
+    def __init__(self, env, al_quedar_libre, capacity=1):
+        super().__init__(env, capacity)
+        self.al_quedar_libre = al_quedar_libre
+
+    @property
+    def libre(self):
+        return not self.users and not self.queue
+
+    def release(self, request, en_este_tick=False):
+        liberacion = super().release(request)
+        if self.libre:
+            self.al_quedar_libre(en_este_tick)
+        return liberacion
+
+
+class GranoMuelle(simpy.Container):
+    """
+    Grano disponible en el muelle. Mantiene `vacio` al día en cada put/get
+    para que los camiones no consulten `level` en cada verificación.
+    """
+    def __init__(self, env, init=0):
+        super().__init__(env, init=init)
+        self.vacio = init == 0
+
+    def _do_put(self, event):
+        resultado = super()._do_put(event)
+        self.vacio = self._level == 0
+        return resultado
+
+    def _do_get(self, event):
+        resultado = super()._do_get(event)
+        self.vacio = self._level == 0
+        return resultado
+
+
+class Puerto:
+    def __init__(self, env, parametros: ParametrosOperacion = None, tipo_tonelaje='d'):
+        self.env = env
+        self.parametros = parametros if parametros is not None else ParametrosOperacion()
+        self.frente_atraque = simpy.Resource(env, capacity=1)
+        self.puerta_entrada = PuertaEntrada(env, self.avisar_falta_camiones)
+        self.puerta_salida = simpy.Resource(env, capacity=1)
+        self.chutes = simpy.Resource(env, capacity=5)
+        self.grano_muelle = GranoMuelle(env)
+        self.iniciar_llegada_camiones = EventoDifusion(env)
+        self.inicio_descarga_evento = EventoDifusion(env)
+        self.fin_descarga_evento = EventoDifusion(env)
+        self.falta_camiones_event = EventoDifusion(env)
+        self.buques_peridos = 0
+        self.current_buque = None
+        self.arribo_buque_evento = env.event()
+        self.buques_atendidos = RegistroColumnar({
+            'id_buque': 'q', 'largo_cola_al_arribar': 'q',
+            # typecode del tonelaje: 'q' si los datos lo traen entero
+            'tonelaje': tipo_tonelaje, 'arribo': 'd',
+            'tiempo_espera': 'd', 'tiempo_descarga': 'd',
+            'num_camiones_normales': 'q', 'num_camiones_dedicados': 'q',
+        })
+        # Monitoreo diario de la rada
+        self.rada = RegistroColumnar({
+            'dia': 'i', 'largo_cola': 'i', 'atendidos': 'i', 'perdidos': 'i',
+        })
+
+    def avisar_falta_camiones(self, en_este_tick):
+        """
+        Se llama cuando la puerta de entrada queda libre: dispara el evento
+        de falta de camiones en el tick del monitoreo periódico que reemplaza,
+        si la puerta sigue libre. Sin camiones dedicados esperando no agenda
+        nada: quien empiece a esperar con la puerta libre revisa el tick solo.
+        """
+        if not self.falta_camiones_event.esperando:
+            return
+        espera = _hasta_el_tick(self.env.now, en_este_tick)
+        if espera == 0:
+            self.falta_camiones_event.disparar()
+        else:
+            self.env.timeout(espera).callbacks.append(self._revisar_puerta)
+
+    def _revisar_puerta(self, _):
+        if self.puerta_entrada.libre:
+            self.falta_camiones_event.disparar()
+
+
+class Bodega:
+    def __init__(self, env, grano_bodega_init, parametros: ParametrosOperacion = None):
+        self.env = env
+        self.parametros = parametros if parametros is not None else ParametrosOperacion()
+        self.grano_bodega = simpy.Container(env, init=grano_bodega_init)
+        self.cargar_en_bodega = simpy.Resource(env, capacity=1)
+        self.descargar_en_bodega = simpy.Resource(env, capacity=1)
+        self.bodega_recargada = EventoDifusion(env)
+        # tipo 0: camión dedicado descarga en bodega; tipo 1: camión carga en bodega
+        self.eventos_bodega = RegistroColumnar({
+            'tipo': 'b', 'id_camion': 'q',
+            'horas en cola bodega': 'd',
+            'horas de descarga en bodega': 'd',
+            'horas de carga en bodega': 'd',
+            'tons depositadas en bodega': 'd',
+            'tons retiradas de bodega': 'd',
+            'ton restante bodega': 'd',
+        })
+        if grano_bodega_init > 0:
+            self.bodega_recargada.disparar()
+
+
+class Buque:
+    __slots__ = ('env', 'id_buque', 'tonelaje', 'puerto', 'num_camiones_normales',
+                 'num_camiones_dedicados', 'largo_cola_al_arribar', 'arribo',
+                 'primera_espia', 'tiempo_espera', 'inicio_descarga', 'tiempo_descarga')
+
+    def __init__(self, env, puerto: Puerto, id_buque, tonelaje):
+        self.env = env
+        self.id_buque = id_buque
+        self.tonelaje = tonelaje
+        self.puerto = puerto
+        self.num_camiones_normales = 0
+        self.num_camiones_dedicados = 0
+        self.largo_cola_al_arribar = len(puerto.frente_atraque.queue)
+
+    def proceso_buque(self, env, puerto):
+        """
+        Proceso que maneja la llegada de un buque, el atraque,
+        la espera y la descarga.
+        """
+        timeout = env.timeout
+        grano_muelle = puerto.grano_muelle
+        p = puerto.parametros
+
+        self.arribo = env.now
+        with puerto.frente_atraque.request() as request_muelle:
+            yield request_muelle
+
+            yield timeout(p.tiempo_llegada_camiones)
+
+            puerto.current_buque = self
+
+            # Iniciar la llegada de camiones:
+            puerto.iniciar_llegada_camiones.disparar()
+
+            yield timeout(p.tiempo_atraque - p.tiempo_llegada_camiones)
+            # fin de atraque, comienza descarga
+
+            self.primera_espia = env.now
+            self.tiempo_espera = self.primera_espia - self.arribo
+            yield timeout(p.tiempo_espiarse)
+
+            # yield env.timeout(choice(buques['minutos_delay'].values))
+
+            # Cargar el grano en el muelle
+            yield grano_muelle.put(self.tonelaje)
+
+            puerto.inicio_descarga_evento.disparar()
+            self.inicio_descarga = env.now
+            # Esperar a que se dispare el evento de fin de descarga
+            yield puerto.fin_descarga_evento.esperar()
+            puerto.current_buque = None
+            self.tiempo_descarga = env.now - self.inicio_descarga
+
+            puerto.buques_atendidos.agregar(
+                self.id_buque, self.largo_cola_al_arribar, self.tonelaje,
+                self.arribo, self.tiempo_espera, self.tiempo_descarga,
+                self.num_camiones_normales, self.num_camiones_dedicados)
+
+
+class Camion:
+    __slots__ = ('env', 'id', 'capacidad', 'carga', 'puerto', 'proceso')
+
+    def __init__(self, env, id_camion, capacidad, puerto: Puerto):
+        self.env = env
+        self.id = id_camion
+        self.capacidad = capacidad
+        self.carga = 0
+        self.puerto = puerto
+        self.proceso = env.process(self.proceso_camion(env, puerto))
+
+    def proceso_camion(self, env,  puerto: Puerto):
+        """
+        Proceso del camión normal que entra por la puerta,
+        solicita chute y carga desde el muelle, luego sale por la puerta de salida.
+        """
+        timeout = env.timeout
+        puerta_entrada = puerto.puerta_entrada
+        grano_muelle = puerto.grano_muelle
+        puerta_salida = puerto.puerta_salida
+        p = puerto.parametros
+        medio_tiempo_puerta = p.tiempo_puerta_entrada/2
+
+        req_puerta_entrada = puerta_entrada.request()
+        yield req_puerta_entrada
+        yield timeout(medio_tiempo_puerta)
+        with puerto.chutes.request() as req_chute:
+            yield req_chute
+            yield timeout(medio_tiempo_puerta)
+
+            # liberación tras el propio timeout: el monitoreo del tick ya la ve
+            puerta_entrada.release(req_puerta_entrada, en_este_tick=True)
+
+            # Verificación de pausa en caso de horario de colación (ejemplo simple)
+            espera = _espera_colacion(env.now % 1440)
+            if espera:
+                yield timeout(espera)
+
+            # Esperar a que comience la descarga si no hay buque o no hay grano
+            if grano_muelle.vacio or puerto.current_buque is None:
+                yield puerto.inicio_descarga_evento.esperar()
+
+            # Carga mínima entre la capacidad del camión y lo disponible en muelle
+            carga = min(self.capacidad,  grano_muelle.level)
+            yield grano_muelle.get(carga)
+            self.carga = carga
+            puerto.current_buque.num_camiones_normales += 1
+
+            # Si ya no queda grano y todavía está en curso la descarga del buque,
+            # se dispara el evento fin de descarga
+            if grano_muelle.vacio:
+                puerto.fin_descarga_evento.disparar()
+
+            yield timeout(p.tiempo_cargar_en_chute)
+        req_puerta_salida = puerta_salida.request()
+        yield req_puerta_salida
+        # Tiempo de salida del puerto
+        yield timeout(p.tiempo_puerta_salida)
+        puerta_salida.release(req_puerta_salida)
+
+
+class CamionDedicado:
+    __slots__ = ('env', 'id', 'capacidad', 'puerto', 'bodega', 'carga', 'proceso',
+                 't_llegada_bodega', 't_inicio_descarga_bodega', 'carga_depositada',
+                 'fin_descarga', 'tiempo_en_cola', 'tiempo_descarga')
+
+    def __init__(self, env, id_camion, capacidad, puerto: Puerto, bodega: Bodega):
+        self.env = env
+        self.id = id_camion
+        self.capacidad = capacidad
+        self.puerto = puerto
+        self.bodega = bodega
+        self.carga = 0
+        self.proceso = env.process(
+            self.proceso_camion_dedicado(env, puerto, bodega))
+
+    def proceso_camion_dedicado(self, env, puerto, bodega):
+        """
+        El camión dedicado viaja repetidamente entre el muelle y la bodega.
+        Solo parte cuando no hay camiones normales disponibles y se requiere traslado.
+        """
+        timeout = env.timeout
+        puerta_entrada = puerto.puerta_entrada
+        chutes = puerto.chutes
+        grano_muelle = puerto.grano_muelle
+        grano_bodega = bodega.grano_bodega
+        descargar_en_bodega = bodega.descargar_en_bodega
+        p = puerto.parametros
+        tiempo_entrada = p.tiempo_entrada_camion_dedicado
+        tiempo_cargar_en_chute = p.tiempo_cargar_en_chute
+        tiempo_a_bodega = p.tiempo_a_bodega
+        tiempo_descargar_en_bodega = p.tiempo_descargar_en_bodega
+        tiempo_salida_de_bodega = p.tiempo_salida_de_bodega
+
+        # Al partir (t=0) el monitoreo ya revisó la puerta en ese tick; las
+        # vueltas siguientes parten tras el timeout de salida de bodega
+        en_este_tick = False
+        while True:
+            # Esperar hasta que se dispare el evento de falta de camiones
+            # (si la puerta ya está libre basta con esperar el próximo tick)
+            esperar = True
+            while esperar:
+                espera = _hasta_el_tick(env.now, en_este_tick) if puerta_entrada.libre else None
+                if espera:
+                    yield timeout(espera)
+                if espera is None or not puerta_entrada.libre:
+                    yield puerto.falta_camiones_event.esperar()
+                yield timeout(2)
+                if puerta_entrada.libre:
+                    esperar = False
+
+            # Entra al muelle
+            req_puerta = puerta_entrada.request()
+            yield req_puerta
+
+            # Tiempo de entrada exclusivo para camiones dedicados
+            yield timeout(tiempo_entrada)
+
+            with chutes.request() as req_chute:
+                yield req_chute
+
+                puerta_entrada.release(req_puerta)
+
+                espera = _espera_colacion(env.now % 1440)
+                if espera:
+                    yield timeout(espera)
+
+                # Si no hay grano o no hay buque, esperar el inicio de descarga
+                if grano_muelle.vacio or puerto.current_buque is None:
+                    yield puerto.inicio_descarga_evento.esperar()
+
+                carga = min(self.capacidad,  grano_muelle.level)
+                yield grano_muelle.get(carga)
+                self.carga = carga
+                puerto.current_buque.num_camiones_dedicados += 1
+
+                if grano_muelle.vacio:
+                    puerto.fin_descarga_evento.disparar()
+
+                yield timeout(tiempo_cargar_en_chute)
+
+            # Traslado a la bodega
+            yield timeout(tiempo_a_bodega)
+
+            # Descarga en la bodega
+            self.t_llegada_bodega = env.now
+            with descargar_en_bodega.request() as req_bodega:
+                yield req_bodega
+                self.t_inicio_descarga_bodega = env.now
+
+                yield timeout(tiempo_descargar_en_bodega)
+                yield grano_bodega.put(self.carga)
+                bodega.bodega_recargada.disparar()
+
+                self.carga_depositada = self.carga
+                self.carga = 0
+                self.fin_descarga = env.now
+
+                self.tiempo_en_cola = self.t_inicio_descarga_bodega-self.t_llegada_bodega
+                self.tiempo_descarga = self.fin_descarga-self.t_inicio_descarga_bodega
+
+                bodega.eventos_bodega.agregar(
+                    0, self.id, self.tiempo_en_cola/60, self.tiempo_descarga/60, 0,
+                    self.carga_depositada, 0, grano_bodega.level)
+
+            yield timeout(tiempo_salida_de_bodega)
+            en_este_tick = True
+
+
+class CamionBodega:
+    __slots__ = ('env', 'id', 'capacidad', 'carga', 'proceso', 'tiempo_llegada',
+                 'inicio_carga', 'fin_carga', 'tiempo_en_cola', 'tiempo_carga')
+
+    def __init__(self, env, id_camion_bodega, capacidad, bodega):
+        self.env = env
+        self.id = id_camion_bodega
+        self.capacidad = capacidad
+        self.carga = 0
+        self.proceso = env.process(self.proceso_camion_bodega(env, bodega))
+
+    def proceso_camion_bodega(self, env, bodega: Bodega):
+        """
+        Camión que se carga en la bodega y luego sale.
+        """
+        p = bodega.parametros
+        self.tiempo_llegada = env.now
+        with bodega.cargar_en_bodega.request() as req_cargar_bodega:
+            yield req_cargar_bodega
+            self.inicio_carga = env.now
+
+            # Espera si la bodega está vacía
+            if bodega.grano_bodega.level == 0:
+                yield bodega.bodega_recargada.esperar()
+
+            yield env.timeout(p.tiempo_cargar_en_bodega)
+
+            carga = min(self.capacidad,  bodega.grano_bodega.level)
+            yield bodega.grano_bodega.get(carga)
+            self.carga = carga
+            self.fin_carga = env.now
+
+            self.tiempo_en_cola = self.inicio_carga-self.tiempo_llegada
+            self.tiempo_carga = self.fin_carga-self.inicio_carga
+
+            bodega.eventos_bodega.agregar(
+                1, self.id, self.tiempo_en_cola/60, 0, self.tiempo_carga/60,
+                0, self.carga, bodega.grano_bodega.level)
+
+            yield env.timeout(p.tiempo_salida_de_bodega)
+
+def generar_buques(env: simpy.Environment, puerto: Puerto, entre_arribos, tonelajes):
+    """
+    Genera buques en el sistema basados en una tasa de llegada exponencial.
+    `entre_arribos` y `tonelajes` son iteradores con los tiempos entre
+    arribos y los tonelajes muestreados.
+    """
+    maximo_rada = puerto.parametros.maximo_rada
+    i_buques = 0
+    while True:
+        tiempo_entre_arribo = next(entre_arribos)
+        yield env.timeout(tiempo_entre_arribo)
+
+        # Si la cola es muy larga, se asume que el buque se pierde
+        if len(puerto.frente_atraque.queue) < maximo_rada:
+            buque = Buque(env, puerto, i_buques, next(tonelajes))
+            env.process(buque.proceso_buque(env, puerto))
+            i_buques += 1
+        else:
+            puerto.buques_peridos += 1
+
+
+def iniciar_cola_buques(env: simpy.Environment, puerto: Puerto, tonelajes):
+    """
+    Crea en bloque los buques que inician la simulación en la rada, uno por
+    cada tonelaje. El proceso termina cuando todos ellos han sido atendidos.
+    """
+    procesos = [env.process(Buque(env, puerto, i, tonelaje).proceso_buque(env, puerto))
+                for i, tonelaje in enumerate(tonelajes)]
+    yield env.all_of(procesos)
+
+
+def generar_camiones_puerto(env, puerto, llega_al_puerto, entre_llegadas, capacidades):
+    """
+    Genera camiones normales que llegan al puerto para cargar.
+    `llega_al_puerto` entrega, para cada intento, si el camión va al puerto
+    (probabilidad 1-p); `entre_llegadas` es un dict turno -> iterador de
+    tiempos entre llegadas y `capacidades` un iterador de capacidades.
+    """
+    camion_puerto_id = 0
+    while True:
+        yield puerto.iniciar_llegada_camiones.esperar()
+
+        while puerto.current_buque is not None:
+            hora = (env.now % 1440) // 60
+            turno = determinar_turno(hora)
+            if next(llega_al_puerto):
+                yield env.timeout(next(entre_llegadas[turno]))
+
+            # Ejemplo de uso de p (no se emplea aquí, pero se deja para posibles extensiones)
+                Camion(env, camion_puerto_id, next(capacidades), puerto)
+                camion_puerto_id += 1
+
+
+def generar_camiones_bodega(env, bodega, llega_a_bodega, entre_llegadas, capacidades):
+    """
+    Genera camiones que se cargan en la bodega.
+    `llega_a_bodega` entrega, para cada intento, si se genera el camión
+    (probabilidad p); los demás iteradores son los de `generar_camiones_puerto`.
+    """
+    camion_bodega_id = 0
+    while True:
+        # Espera hasta que la bodega tenga algo de grano
+        yield bodega.bodega_recargada.esperar()
+
+        while bodega.grano_bodega.level > 0:
+            hora = (env.now % 1440) // 60
+            turno = determinar_turno(hora)
+            if next(llega_a_bodega):
+                yield env.timeout(next(entre_llegadas[turno]))
+
+                CamionBodega(env, camion_bodega_id, next(capacidades), bodega)
+                camion_bodega_id += 1
+
+
+def monitor_cola_buques(env, puerto: Puerto):
+    """
+    Monitorea la cola de buques en el muelle y guarda un registro diario
+    en `puerto.rada`.
+    """
+    while True:
+        yield env.timeout(60*24)
+        puerto.rada.agregar(
+            int(env.now // 1440),
+            len(puerto.frente_atraque.queue) + len(puerto.frente_atraque.users),
+            len(puerto.buques_atendidos), puerto.buques_peridos)
@@ -0,0 +1,5 @@
+#!/usr/bin/env sh
+# Perfila la interfaz completa con py-spy y deja el flamegraph en flame.svg
+# (se escribe al detener Streamlit con Ctrl+C).
+cd "$(dirname "$0")/.." || exit 1
+exec py-spy record --native -r 200 -o flame.svg -- python -m streamlit run ui_puertov2.py "$@"
@@ -0,0 +1,89 @@
+"""
+Chequeo de regresión con semilla fija.
+
+Corre la simulación sobre datos sintéticos (siempre los mismos) con semillas
+fijas y compara los KPI de los buques atendidos contra los valores de
+REFERENCIA. Un cambio que no debería alterar el modelo tiene que dejarlos
+idénticos; si el cambio altera el modelo a propósito, actualice REFERENCIA
+con la salida del script y explique la diferencia en el commit.
+
+Uso: python scripts/regresion_semilla.py
+"""
+import math
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import clases_sim  # noqa: E402
+
+AÑOS = 0.25
+SEMILLAS = (0, 1, 2)
+# (camiones_dedicados, grano, cap, prob, buques_inicio_cola)
+ESCENARIOS = {
+    'sin dedicados': (0, 100, 30, 0.2, 3),
+    'con dedicados': (3, 1000, 30, 0.3, 3),
+}
+# escenario -> semilla -> (buques atendidos, viajes dedicados, descarga media en días)
+REFERENCIA = {
+    'sin dedicados': {0: (10, 0, 4.461592389), 1: (12, 0, 4.549734801), 2: (15, 0, 4.382624324)},
+    'con dedicados': {0: (10, 3292, 3.385649115), 1: (12, 4083, 3.413748331), 2: (16, 5329, 3.353275931)},
+}
+
+
+def datos_sinteticos(n_camiones=3000, n_buques=400):
+    rng = np.random.default_rng(0)
+    camiones = pd.DataFrame({
+        'año': rng.choice([2022, 2023, 2024], n_camiones),
+        'turno': rng.choice([1, 2, 3], n_camiones),
+        'min_entre_camiones': rng.exponential(4, n_camiones) + 0.5,
+        'capacidad': rng.uniform(15, 35, n_camiones),
+    })
+    inicio = pd.Timestamp('2023-01-01') + pd.to_timedelta(rng.uniform(0, 700, n_buques), unit='D')
+    buques = pd.DataFrame({
+        'tiempo_descarga': rng.uniform(35, 130, n_buques),
+        'tiempo_entre_arribos': rng.uniform(20, 300, n_buques),
+        'tiempo_de_espera': rng.uniform(0, 200, n_buques),
+        'total_detenciones': rng.uniform(0, 20, n_buques),
+        'total_falta_equipos': rng.uniform(0, 10, n_buques),
+        'tonelaje': rng.uniform(20000, 60000, n_buques).round(),
+        'primera_espia': inicio,
+    })
+    buques['inicio_descarga'] = buques['primera_espia'] + pd.to_timedelta(
+        rng.uniform(0.5, 10, n_buques), unit='h')
+    return camiones, buques
+
+
+def kpis(escenario, seed):
+    dedicados, grano, cap, prob, inicio_cola = ESCENARIOS[escenario]
+    # sin resultados guardados en disco: siempre se corre la simulación
+    df_buques = clases_sim.simulacion(AÑOS, dedicados, grano, cap, prob, inicio_cola, seed=seed,
+                                      usar_cache=False)[0]
+    return (len(df_buques), int(df_buques['Camiones dedicados'].sum()),
+            round(float(df_buques['Tiempo descarga (dias)'].mean()), 9))
+
+
+def main():
+    clases_sim.load_data(*datos_sinteticos())
+
+    obtenido = {esc: {s: kpis(esc, s) for s in SEMILLAS} for esc in ESCENARIOS}
+    fallas = 0
+    for esc, por_semilla in obtenido.items():
+        for s, valores in por_semilla.items():
+            esperado = REFERENCIA.get(esc, {}).get(s)
+            ok = esperado is not None and valores[:2] == esperado[:2] and math.isclose(
+                valores[2], esperado[2], rel_tol=1e-9)
+            fallas += not ok
+            print(f"{'ok   ' if ok else 'FALLA'} {esc} seed={s}: {valores} (referencia {esperado})")
+    if fallas:
+        print('\nREFERENCIA = {')
+        for esc, por_semilla in obtenido.items():
+            print(f'    {esc!r}: {por_semilla!r},')
+        print('}')
+    return 1 if fallas else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -45,9 +45,12 @@ def run_sim(
 # --------------------- KPIs principales para mostrar en la UI -----------------------------
 def _kpis(df_buques: pd.DataFrame, df_cola: pd.DataFrame, df_bodega: pd.DataFrame | None):
     kpi = {}
-    kpi["Tiempo medio de espera (días)"] = df_buques["Tiempo de espera (dias)"].mean()
-    kpi["Tiempo medio de descarga (días)"] = df_buques["Tiempo descarga (dias)"].mean()
-    kpi["Camiones normales / buque"] = df_buques["Camiones normales"].mean()
+    # una sola reducción para las tres medias de buques
+    medias = df_buques[["Tiempo de espera (dias)", "Tiempo descarga (dias)", "Camiones normales"]].mean()
+    kpi.update(zip(
+        ["Tiempo medio de espera (días)", "Tiempo medio de descarga (días)", "Camiones normales / buque"],
+        medias.to_numpy(),
+    ))
     if df_bodega is not None:
         kpi["Tons restantes en bodega"] = df_bodega["ton restante bodega"].iloc[-1]
     kpi["Buques perdidos"] = df_cola["total buques perdidos"].max()
@@ -1,20 +1,43 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import contextlib
+import cProfile
+import hashlib
+import html
 import io
+import os
+import re
 import time
+import warnings
+from dataclasses import asdict, dataclass
+from functools import partial
 from typing import List, Dict, Tuple, Optional
 from pathlib import Path
 
-import altair as alt
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import seaborn as sns
+import pyarrow as pa
+import pyarrow.csv as pv
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
 import streamlit as st
 from datetime import datetime
 
+try:
+    import python_calamine  # noqa: F401  (motor 'calamine' de pd.read_excel)
+    HAS_CALAMINE = True
+except ImportError:  # python-calamine es opcional: sin él se usa openpyxl en modo lectura
+    HAS_CALAMINE = False
+
+try:
+    import xlsxwriter
+    HAS_XLSXWRITER = True
+except ImportError:  # sin xlsxwriter el Excel se arma con openpyxl
+    HAS_XLSXWRITER = False
+
 import clases_sim
+import clases_sim_core
 #from clases_sim import simulacion, load_data
 
 
@@ -45,13 +68,50 @@ OPTIONAL_BUQUES_COLS: List[str] = [
     "inicio_descarga", "primera_espia"
 ]
 
+# Columnas de pocos valores que se cargan como categóricas. "año" queda numérica:
+# load_data la filtra con una comparación (> 2022)
+CATEGORY_COLS: List[str] = ["turno"]
+
 
 GITHUB_REPO_URL = "https://github.com/Ignaciagothe/sim_puerto"  
 
+@dataclass(frozen=True, slots=True)
+class Scenario:
+    """Scalar arguments of one `clases_sim.simulacion` run."""
+    años: int
+    camiones_dedicados: int
+    grano: int
+    cap: int
+    prob: float
+    buques_inicio_cola: int
+    seed: int
+
+# Filas leídas de cada archivo para validarlo y mostrar la vista previa
+PREVIEW_ROWS = 50
+
+# Máximo de puntos enviados al navegador por gráfico. La agregación se hace en
+# pandas/NumPy antes de st.vega_lite_chart, que envía los datos como Arrow.
+CHART_MAX_POINTS = 2000
+
+# Filas convertidas a objetos Python a la vez al escribir el Excel exportado
+EXCEL_CHUNK_ROWS = 10_000
+
+# Perfil cProfile de cada corrida, solo si el servidor se lanzó con SIM_PUERTO_PROFILE=1
+# (no depende de la URL: un visitante no puede activarlo)
+PROFILE_RUNS = os.environ.get("SIM_PUERTO_PROFILE") == "1"
+PROFILE_PATH = Path(__file__).with_name("run.prof")
+
+# Copias Feather de los archivos subidos, una por contenido y columnas leídas
+UPLOAD_CACHE_DIR = Path(__file__).with_name("upload_cache")
+# Subir al cambiar cómo se leen los archivos (columnas, downcast, CATEGORY_COLS)
+UPLOAD_CACHE_VERSION = 1
+# Copias que se conservan; al superarlo se borran las de uso más antiguo
+UPLOAD_CACHE_MAX_FILES = 16
+
 # -----------------------------------------------------------------------------
 # CSS estilo
 # -----------------------------------------------------------------------------
-st.markdown("""
+CUSTOM_CSS = """
 <style>
     /* Professional Corporate Styling */
     .main {
@@ -77,6 +137,34 @@ st.markdown("""
         font-weight: 700;
     }
     
+    /* Grilla de KPI: todas las tarjetas de una fila en un solo elemento */
+    .kpi-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
+        gap: 1rem;
+        margin-bottom: 1rem;
+    }
+    
+    .kpi-card {
+        background-color: #ffffff;
+        padding: 20px;
+        border-radius: 10px;
+        box-shadow: 0 2px 10px rgba(0,0,0,0.08);
+        border: 1px solid #e0e0e0;
+    }
+    
+    .kpi-card .kpi-label {
+        color: #2c3e50;
+        font-weight: 600;
+        font-size: 0.9rem;
+    }
+    
+    .kpi-card .kpi-value {
+        color: #1a73e8;
+        font-weight: 700;
+        font-size: 1.8rem;
+    }
+    
     .success-box {
         padding: 1rem;
         border-radius: 0.5rem;
@@ -227,42 +315,215 @@ st.markdown("""
         margin-bottom: 1rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+# Se arma una sola vez al importar: sin comentarios ni sangría, que es lo
+# que se reenvía en cada rerun. Tiene que emitirse en todos los reruns:
+# un elemento que no se vuelve a dibujar desaparece de la página.
+CUSTOM_CSS = re.sub(r"\s*([{};])\s*", r"\1",
+                    re.sub(r"\s+", " ", re.sub(r"/\*.*?\*/", "", CUSTOM_CSS, flags=re.S))).strip()
+
+st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+
+def column_filter(columns: Optional[List[str]]):
+    """`usecols` callable keeping only `columns` (all of them if None), by set lookup."""
+    return frozenset(columns).__contains__ if columns else None
+
+def read_excel_stream(file, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read the first sheet of an .xlsx file row by row, without building the workbook DOM.
+
+    Only the `columns` present in the sheet are kept, as in `read_csv_columns`.
+    """
+    file.seek(0)
+    if HAS_CALAMINE:
+        return pd.read_excel(file, engine='calamine', usecols=column_filter(columns))
+
+    import openpyxl
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return pd.DataFrame()
+        df = pd.DataFrame.from_records(rows, columns=header)
+        return df[df.columns.intersection(columns)] if columns else df
+    finally:
+        wb.close()
+
+def read_csv_columns(file, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Read a CSV file with pyarrow's multithreaded reader, keeping only `columns`.
+
+    Requested columns that are not in the file are left out, so that
+    `validate_dataframe` still reports them as missing. With `nrows` only the
+    first block of the file is parsed.
+    """
+    convert = pv.ConvertOptions(include_columns=columns, include_missing_columns=True) \
+        if columns else pv.ConvertOptions()
+    # lectura directa sobre el buffer del archivo subido, sin copiar los bytes
+    source = pa.BufferReader(pa.py_buffer(file.getbuffer()))
+    if nrows is None:
+        tbl = pv.read_csv(source, convert_options=convert)
+    else:
+        reader = pv.open_csv(source, convert_options=convert)
+        try:
+            tbl = pa.Table.from_batches([reader.read_next_batch()]).slice(0, nrows)
+        except StopIteration:  # archivo con encabezado y sin filas
+            tbl = reader.schema.empty_table()
+    absent = [f.name for f in tbl.schema if pa.types.is_null(f.type)]
+    if absent:
+        tbl = tbl.drop_columns(absent)
+    return tbl.to_pandas(split_blocks=True, self_destruct=True)
+
+def read_parquet_columns(file, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Read a Parquet file, decoding only the `columns` it contains.
+
+    Like `read_csv_columns`, absent columns are left out for `validate_dataframe`
+    to report, and with `nrows` only the first rows are decoded.
+    """
+    pf = pq.ParquetFile(pa.BufferReader(pa.py_buffer(file.getbuffer())))
+    if columns:
+        names = set(pf.schema_arrow.names)
+        columns = [col for col in columns if col in names]
+    if nrows is None:
+        tbl = pf.read(columns=columns)
+    else:
+        batch = next(pf.iter_batches(batch_size=nrows, columns=columns), None)
+        tbl = pa.Table.from_batches([batch]) if batch is not None \
+            else pf.schema_arrow.empty_table().select(columns or pf.schema_arrow.names)
+    return tbl.to_pandas(split_blocks=True, self_destruct=True)
+
+def downcast_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast numeric columns to float32 and the smallest integer type that fits."""
+    for col in df.select_dtypes("integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes("float").columns:
+        df[col] = pd.to_numeric(df[col], downcast="float")
+    return df
 
+def file_signature(file) -> str:
+    """Content hash of an uploaded file, used as its cache key."""
+    # getbuffer() expone los bytes del archivo sin copiarlos, a diferencia de getvalue()
+    return hashlib.blake2b(file.getbuffer()).hexdigest()
 
-@st.cache_data
-def load_file(file) -> pd.DataFrame:
-    """Load CSV or Excel file with proper error handling."""
+def upload_cache_path(file_sig: str, columns: Optional[List[str]]) -> Path:
+    """Feather copy of an upload, named after its content, read columns and UPLOAD_CACHE_VERSION."""
+    cols_sig = "all" if columns is None else \
+        hashlib.blake2b("\x1f".join(columns).encode(), digest_size=8).hexdigest()
+    return UPLOAD_CACHE_DIR / f"{file_sig}-{cols_sig}-v{UPLOAD_CACHE_VERSION}.feather"
+
+def prune_upload_cache(max_files: int = UPLOAD_CACHE_MAX_FILES) -> None:
+    """Delete the least recently used Feather copies beyond `max_files`."""
+    copies = sorted(UPLOAD_CACHE_DIR.glob("*.feather"), key=lambda f: f.stat().st_mtime, reverse=True)
+    for old in copies[max_files:]:
+        # en Windows una copia mapeada en memoria no se puede borrar: queda para la próxima
+        with contextlib.suppress(OSError):
+            old.unlink()
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def load_file(file_sig: str, _file, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Load CSV, Parquet or Excel file with proper error handling.
+
+    CSV and Parquet files are read with only `columns` (all of them if None).
+    Cached by the upload signature `file_sig` and shared between sessions:
+    callers must not modify the returned DataFrame. The parsed table is also
+    kept as an uncompressed Feather file (see `upload_cache_path`), so the
+    same file is memory-mapped instead of parsed again after a restart.
+    """
     try:
-        ext = Path(file.name).suffix.lower()
+        cache = upload_cache_path(file_sig, columns)
+        if cache.exists():
+            with contextlib.suppress(OSError):
+                cache.touch()  # marca de uso para prune_upload_cache
+            # split_blocks: columnas numéricas sin consolidar, vistas del archivo mapeado
+            return feather.read_table(cache, memory_map=True).to_pandas(split_blocks=True, self_destruct=True)
+
+        ext = Path(_file.name).suffix.lower()
         if ext == '.csv':
-            df = pd.read_csv(file)
-        elif ext in ['.xlsx', '.xls']:
-            df = pd.read_excel(file, engine='openpyxl' if ext == '.xlsx' else 'xlrd')
+            df = read_csv_columns(_file, columns)
+        elif ext == '.parquet':
+            df = read_parquet_columns(_file, columns)
+        elif ext == '.xlsx':
+            df = read_excel_stream(_file, columns)
+        elif ext == '.xls':
+            # calamine también lee el formato binario antiguo; xlrd solo como respaldo
+            df = pd.read_excel(_file, engine='calamine' if HAS_CALAMINE else 'xlrd',
+                               usecols=column_filter(columns))
         else:
             raise ValueError(f"Unsupported file type: {ext}")
+        df = downcast_numeric(df)
+        for col in df.columns.intersection(CATEGORY_COLS):
+            df[col] = df[col].astype("category")
+        try:
+            UPLOAD_CACHE_DIR.mkdir(exist_ok=True)
+            df.to_feather(cache, compression="uncompressed")
+            prune_upload_cache()
+        except (OSError, TypeError, ValueError):
+            # sin permisos de escritura o columnas no serializables: sin cache
+            pass
         return df
     except Exception as e:
         st.error(f"Error loading file: {str(e)}")
         return None
 
+@st.cache_data(max_entries=8, show_spinner=False)
+def load_preview(file_sig: str, _file, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """First PREVIEW_ROWS rows of an upload, enough to validate columns and show a preview.
+
+    The whole file is only parsed by `load_file`, when the simulation runs.
+    """
+    try:
+        ext = Path(_file.name).suffix.lower()
+        if ext == '.csv':
+            return read_csv_columns(_file, columns, nrows=PREVIEW_ROWS)
+        if ext == '.parquet':
+            return read_parquet_columns(_file, columns, nrows=PREVIEW_ROWS)
+        if ext in ('.xlsx', '.xls'):
+            _file.seek(0)
+            engine = 'calamine' if HAS_CALAMINE else ('xlrd' if ext == '.xls' else 'openpyxl')
+            return pd.read_excel(_file, nrows=PREVIEW_ROWS, engine=engine,
+                                 usecols=column_filter(columns))
+        raise ValueError(f"Unsupported file type: {ext}")
+    except Exception as e:
+        st.error(f"Error loading file: {str(e)}")
+        return None
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def preview_table(file_sig: str, _df: pd.DataFrame, rows: int = 5) -> pa.Table:
+    """First rows of an upload already converted to Arrow, reused by every rerun of the sidebar."""
+    # Arrow es inmutable: se puede compartir sin copiar entre reruns y sesiones
+    return pa.Table.from_pandas(_df.head(rows), preserve_index=False)
+
 def validate_dataframe(df: pd.DataFrame, required_cols: List[str], name: str) -> Tuple[bool, List[str]]:
     """Validate that DataFrame has required columns."""
     if df is None:
         return False, []
-    missing = [col for col in required_cols if col not in df.columns]
-    return len(missing) == 0, missing
+    cols = set(df.columns)
+    missing = [col for col in required_cols if col not in cols]
+    return not missing, missing
 
-def create_metric_card(label: str, value: float) -> None:
-    """Create a professional metric card."""
+def format_kpi(label: str, value: float) -> str:
+    """Format a main KPI value: ship counts as integers, the rest with two decimals."""
     if label == "Buques atendidos" or label == "Buques perdidos":
-        st.metric(label, f"{int(value):,}")
-    else:
-        st.metric(label, f"{value:,.2f}")
+        return f"{int(value):,}"
+    return f"{value:,.2f}"
+
+def metric_grid(metrics: Dict[str, str]) -> None:
+    """Render a row of metric cards as a single markdown element."""
+    cards = "".join(
+        f'<div class="kpi-card"><div class="kpi-label">{html.escape(label)}</div>'
+        f'<div class="kpi-value">{html.escape(value)}</div></div>'
+        for label, value in metrics.items()
+    )
+    st.markdown(f'<div class="kpi-grid">{cards}</div>', unsafe_allow_html=True)
+
+def generate_summary_report(kpis: dict, stats_buques: pd.DataFrame, stats_cola: pd.DataFrame,
+                            bodega: Optional[dict] = None, params: dict = None) -> str:
+    """Generar resumen ejecutivo de los resultados de la simulación.
 
-def generate_summary_report(df_buques: pd.DataFrame, df_cola: pd.DataFrame, df_bodega: pd.DataFrame = None, params: dict = None) -> str:
-    """Generar resumen ejecutivo de los resultados de la simulación"""
-    report = f"""
+    Usa los KPI y las tablas describe() ya calculadas para la pantalla de resultados.
+    """
+    report = io.StringIO()
+    report.write(f"""
 ================================================================================
                  REPORTE DE SIMULACIÓN - PUERTO PANUL
                           ELOGIS - Consultoría Logística
@@ -292,37 +553,37 @@ Tiempos Operacionales (minutos):
 
 Indicadores Clave de Rendimiento (KPIs):
 ----------------------------------------
-• Buques atendidos: {len(df_buques):,}
-• Tiempo promedio de espera: {df_buques['Tiempo de espera (dias)'].mean():.2f} días
-• Tiempo promedio de descarga: {df_buques['Tiempo descarga (dias)'].mean():.2f} días
-• Largo promedio de cola: {df_cola['Largo cola rada'].mean():.2f} buques
+• Buques atendidos: {kpis["Buques atendidos"]:,}
+• Tiempo promedio de espera: {kpis["Tiempo espera promedio (días)"]:.2f} días
+• Tiempo promedio de descarga: {kpis["Tiempo descarga promedio (días)"]:.2f} días
+• Largo promedio de cola: {kpis["Largo cola promedio"]:.2f} buques
 
 Estadísticas de Buques:
 ----------------------
-{df_buques.describe().to_string()}
+{stats_buques.to_string()}
 
 Estadísticas de Cola:
 --------------------
-{df_cola.describe().to_string()}
-"""
+{stats_cola.to_string()}
+""")
     
-    if df_bodega is not None:
-        report += f"""
+    if bodega is not None:
+        report.write(f"""
 Estadísticas de Bodega:
 ----------------------
-• Toneladas finales en bodega: {df_bodega['ton restante bodega'].iloc[-1]:,.0f}
-• Movimientos totales: {len(df_bodega):,}
-• Camiones que cargaron en bodega: {len(df_bodega[df_bodega['actividad camion '] == 'cargar en bodega']):,}
-"""
+• Toneladas finales en bodega: {bodega["Inventario final (toneladas)"]:,.0f}
+• Movimientos totales: {bodega["Movimientos totales"]:,}
+• Camiones que cargaron en bodega: {bodega["Cargas en bodega"]:,}
+""")
     
-    report += """
+    report.write("""
 ================================================================================
                            © 2025 ELOGIS
               Consultoría en Data Sceince y Logística 
 ================================================================================
-"""
+""")
     
-    return report
+    return report.getvalue()
 
 def calculate_real_data_statistics(buq_df: pd.DataFrame) -> dict:
     """Calculate statistics from real ship data."""
@@ -335,6 +596,556 @@ def calculate_real_data_statistics(buq_df: pd.DataFrame) -> dict:
         stats['unloading_time_days'] = stats['unloading_time_hours'] / 24
     return stats
 
+@st.cache_data(ttl=3600, max_entries=8, show_spinner=False)
+def run_cached(cam_sig: str, buq_sig: str, scenario: Scenario,
+               parametros: clases_sim_core.ParametrosOperacion, _cam_df: pd.DataFrame,
+               _buq_df: pd.DataFrame,
+               _progress_cb=None) -> Tuple[pd.DataFrame, pd.DataFrame, Optional[pd.DataFrame]]:
+    """Run the simulation on the uploaded DataFrames.
+
+    Only the upload signatures, the scenario and the operating times are
+    hashed for the cache key; `_cam_df` and `_buq_df` (the contents behind
+    those signatures) are left out of it, and so is `_progress_cb`, which
+    is only called when the run is not already cached.
+    """
+    clases_sim.load_data(_cam_df, _buq_df)
+
+    results = clases_sim.simulacion(**asdict(scenario), parametros=parametros,
+                                    progress_cb=_progress_cb)
+    if scenario.camiones_dedicados == 0:
+        results = (*results, None)
+    # sin reducir: KPIs, tablas y descargas usan los valores float64 de la simulación;
+    # solo los datos de los gráficos se envían reducidos (ver cola_series)
+    return results
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def hist_bins(vals: np.ndarray, bins: int = 30) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """Histogram bins and a KDE curve scaled to counts, as drawn by sns.histplot(kde=True)."""
+    from scipy.stats import gaussian_kde
+
+    vals = vals[np.isfinite(vals)]
+    counts, edges = np.histogram(vals, bins=bins)
+    xs = np.linspace(edges[0], edges[-1], 200)
+    if len(vals) > 1 and np.ptp(vals) > 0:
+        kde_y = gaussian_kde(vals)(xs) * len(vals) * (edges[1] - edges[0])
+    else:
+        kde_y = np.zeros_like(xs)
+    barras = pd.DataFrame({'desde': edges[:-1], 'hasta': edges[1:], 'Frecuencia': counts})
+    curva = pd.DataFrame({'Días': xs, 'Frecuencia': kde_y})
+    return barras, curva
+
+# -----------------------------------------------------------------------------
+# Especificaciones Vega-Lite de los gráficos
+# -----------------------------------------------------------------------------
+# Diccionarios armados una sola vez: st.vega_lite_chart los envía tal cual,
+# sin pasar por la validación y el to_dict() de Altair en cada rerun.
+AXIS_CONFIG = {"axis": {"labelFontSize": 12, "titleFontSize": 14}}
+# equivalente a .interactive() de Altair: zoom y arrastre en ambos ejes
+ZOOM_PARAMS = [{"name": "zoom", "select": {"type": "interval", "encodings": ["x", "y"]}, "bind": "scales"}]
+
+def chart_title(text: str) -> dict:
+    return {"text": text, "fontSize": 16, "fontWeight": "bold"}
+
+def quantitative(field: str, title: Optional[str] = None, **extra) -> dict:
+    """Vega-Lite encoding of a quantitative `field`."""
+    enc = {"field": field, "type": "quantitative", **extra}
+    if title is not None:
+        enc["title"] = title
+    return enc
+
+QUEUE_CHART_SPEC = {
+    "mark": {"type": "line", "strokeWidth": 3, "color": "#1a73e8",
+             "point": {"filled": True, "fill": "#1a73e8", "size": 80}},
+    "encoding": {
+        "x": quantitative("Dia", "Día de Simulación"),
+        "y": quantitative("Largo cola rada", "Número de Buques en Cola"),
+        "tooltip": [quantitative("Dia", "Día"),
+                    quantitative("Largo cola rada", "Buques en cola")],
+    },
+    "params": ZOOM_PARAMS,
+    "title": chart_title("Evolución de la Cola en Rada"),
+    "width": 600,
+    "height": 400,
+    "config": AXIS_CONFIG,
+}
+
+SCATTER_CHART_SPEC = {
+    "mark": {"type": "circle", "size": 100, "opacity": 0.8},
+    "encoding": {
+        "x": quantitative("Tiempo de espera (dias)", "Tiempo de espera (días)", scale={"zero": False}),
+        "y": quantitative("Tiempo descarga (dias)", "Tiempo de descarga (días)", scale={"zero": False}),
+        "size": quantitative("Tonelaje buque", "Tonelaje", scale={"range": [100, 400]}),
+        "color": quantitative("Largo cola al arribo", "Cola al arribo", scale={"scheme": "viridis"}),
+        "tooltip": [
+            {"field": "BuqueID", "type": "nominal", "title": "ID Buque"},
+            quantitative("Tonelaje buque", "Tonelaje", format=",.0f"),
+            quantitative("Tiempo de espera (dias)", "Espera (días)", format=".2f"),
+            quantitative("Tiempo descarga (dias)", "Descarga (días)", format=".2f"),
+            quantitative("Largo cola al arribo", "Cola al arribo"),
+        ],
+    },
+    "params": ZOOM_PARAMS,
+    "title": chart_title("Espera vs Descarga"),
+    "width": 600,
+    "height": 400,
+    "config": AXIS_CONFIG,
+}
+
+BODEGA_CHART_SPEC = {
+    "mark": {
+        "type": "area",
+        "line": {"color": "#ea4335", "strokeWidth": 3},
+        "color": {"gradient": "linear", "x1": 1, "x2": 1, "y1": 1, "y2": 0,
+                  "stops": [{"color": "#ea4335", "offset": 0}, {"color": "#fbbc04", "offset": 1}]},
+        "opacity": 0.6,
+    },
+    "encoding": {
+        "x": quantitative("index", "Número de Movimiento"),
+        "y": quantitative("ton restante bodega", "Toneladas en Bodega"),
+        "tooltip": [
+            quantitative("index", "Movimiento #"),
+            quantitative("ton restante bodega", "Toneladas", format=",.0f"),
+            {"field": "actividad camion ", "type": "nominal", "title": "Actividad"},
+        ],
+    },
+    "params": ZOOM_PARAMS,
+    "title": chart_title("Evolución del Inventario en Bodega"),
+    "width": 800,
+    "height": 400,
+    "config": AXIS_CONFIG,
+}
+
+def hist_chart(vals, title: str, color: str) -> dict:
+    """Vega-Lite spec of a histogram with its KDE curve, from bins computed (and cached) here."""
+    barras, curva = hist_bins(np.asarray(vals, dtype=np.float64))
+    return {
+        "datasets": {"barras": barras, "curva": curva},
+        "layer": [
+            {
+                "data": {"name": "barras"},
+                "mark": {"type": "bar", "color": color, "opacity": 0.7, "stroke": "white"},
+                "encoding": {
+                    "x": quantitative("desde", "Días", bin="binned"),
+                    "x2": {"field": "hasta"},
+                    "y": quantitative("Frecuencia", "Frecuencia"),
+                    "tooltip": [quantitative("desde", "Desde", format=".2f"),
+                                quantitative("hasta", "Hasta", format=".2f"),
+                                quantitative("Frecuencia", "Buques")],
+                },
+            },
+            {
+                "data": {"name": "curva"},
+                "mark": {"type": "line", "color": color, "strokeWidth": 2},
+                "encoding": {"x": quantitative("Días"), "y": quantitative("Frecuencia")},
+            },
+        ],
+        "title": title,
+        "height": 300,
+    }
+
+def paged(df: pd.DataFrame, key: str, page_size: int = 200) -> pd.DataFrame:
+    """Return one page of `df`, chosen with a page selector widget."""
+    n_pages = max(1, -(-len(df) // page_size))
+    page = st.number_input("Página", min_value=1, max_value=n_pages, value=1, key=key)
+    start = (page - 1) * page_size
+    st.caption(f"Filas {min(start + 1, len(df)):,}–{min(start + page_size, len(df)):,} de {len(df):,} (página {page} de {n_pages})")
+    return df.iloc[start:start + page_size]
+
+def scenario_signature(cam_sig: str, buq_sig: str, params: dict) -> str:
+    """Hash identifying a simulated scenario: its input files and parameters."""
+    return hashlib.blake2b(repr((cam_sig, buq_sig, sorted(params.items()))).encode()).hexdigest()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def result_kpis(scenario_sig: str, _df_buques: pd.DataFrame,
+                _df_cola: pd.DataFrame) -> Tuple[Dict[str, float], Tuple[float, float, float]]:
+    """KPI tiles and the P50/P90/P95 waiting times of a scenario, as plain numbers."""
+    # una matriz (n, 2) de tiempos: ambas medias en una sola reducción
+    tiempos = _df_buques[["Tiempo de espera (dias)", "Tiempo descarga (dias)"]].to_numpy(dtype=np.float64)
+    if len(tiempos):
+        media_espera, media_descarga = (float(m) for m in tiempos.mean(axis=0))
+        percentiles = tuple(float(q) for q in np.quantile(tiempos[:, 0], [0.5, 0.9, 0.95]))
+    else:
+        media_espera = media_descarga = np.nan
+        percentiles = (np.nan, np.nan, np.nan)
+    cola = _df_cola.agg({"Largo cola rada": "mean", "total buques perdidos": "max"}
+                        if 'total buques perdidos' in _df_cola.columns else {"Largo cola rada": "mean"})
+    kpis = {
+        "Buques atendidos": len(_df_buques),
+        "Tiempo espera promedio (días)": media_espera,
+        "Tiempo descarga promedio (días)": media_descarga,
+        "Largo cola promedio": float(cola["Largo cola rada"]),
+    }
+    if 'total buques perdidos' in cola:
+        kpis["Buques perdidos"] = cola["total buques perdidos"]
+    return kpis, percentiles
+
+def describe_numeric(df: pd.DataFrame) -> pd.DataFrame:
+    """Same table as df.describe(), from NumPy reductions over one 2D array of the numeric columns."""
+    num = df.select_dtypes("number")
+    if num.empty:
+        return df.describe()
+    arr = num.to_numpy(dtype=np.float64)
+    with warnings.catch_warnings():
+        # columnas sin valores (todo NaN): NaN en la tabla, como en describe()
+        warnings.simplefilter("ignore", RuntimeWarning)
+        stats = np.vstack([
+            np.count_nonzero(~np.isnan(arr), axis=0),
+            np.nanmean(arr, axis=0),
+            np.nanstd(arr, axis=0, ddof=1),
+            np.nanmin(arr, axis=0),
+            *np.nanpercentile(arr, [25, 50, 75], axis=0),
+            np.nanmax(arr, axis=0),
+        ])
+    return pd.DataFrame(stats, index=["count", "mean", "std", "min", "25%", "50%", "75%", "max"],
+                        columns=num.columns)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def bodega_kpis(scenario_sig: str, _df_bodega: pd.DataFrame) -> Dict[str, float]:
+    """Warehouse metrics shown on screen and in the report, computed once per scenario."""
+    # actividad es categórica: la comparación es sobre los códigos enteros
+    cargas = _df_bodega['actividad camion '] == 'cargar en bodega'
+    return {
+        "Inventario final (toneladas)": float(_df_bodega['ton restante bodega'].iloc[-1]),
+        "Movimientos totales": len(_df_bodega),
+        "Cargas en bodega": int(np.count_nonzero(cargas.to_numpy())),
+    }
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def describe_results(scenario_sig: str, _df_buques: pd.DataFrame,
+                     _df_cola: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """describe() of the ship and queue tables, computed once per scenario."""
+    return describe_numeric(_df_buques), describe_numeric(_df_cola)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def cola_series(scenario_sig: str, _df_cola: pd.DataFrame, max_points: int = CHART_MAX_POINTS) -> pa.Table:
+    """Arrow table with only the columns of the rada queue chart, built once per scenario.
+
+    Long runs are downsampled to `max_points` days with LTTB, like
+    `bodega_series`, so both the peaks and the empty-queue stretches stay visible.
+    """
+    dia = _df_cola['Dia'].to_numpy()
+    largo = _df_cola['Largo cola rada'].to_numpy()
+    if len(dia) > max_points:
+        keep = lttb_indices(largo.astype(np.float64), max_points)
+        dia, largo = dia[keep], largo[keep]
+    # el entero más chico que alcanza: menos bytes enviados al gráfico
+    return pa.table({'Dia': pd.to_numeric(dia, downcast='integer'),
+                     'Largo cola rada': pd.to_numeric(largo, downcast='integer')})
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def scatter_points(scenario_sig: str, _df_buques: pd.DataFrame, max_points: int = CHART_MAX_POINTS) -> pd.DataFrame:
+    """Ships shown in the wait vs unload scatter: a fixed random sample when there are too many."""
+    df = _df_buques[['BuqueID', 'Tiempo de espera (dias)', 'Tiempo descarga (dias)',
+                     'Tonelaje buque', 'Largo cola al arribo']]
+    if len(df) > max_points:
+        df = df.sample(max_points, random_state=0)
+    # float32 basta para dibujar y reduce a la mitad los datos enviados
+    return downcast_numeric(df.copy())
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def bodega_series(scenario_sig: str, _df_bodega: pd.DataFrame, max_points: int = CHART_MAX_POINTS) -> pd.DataFrame:
+    """Warehouse inventory by movement number, downsampled to `max_points` movements with LTTB."""
+    df = _df_bodega[['ton restante bodega', 'actividad camion ']].reset_index()
+    if len(df) > max_points:
+        df = df.iloc[lttb_indices(df['ton restante bodega'].to_numpy(dtype=np.float64), max_points)]
+    return downcast_numeric(df.copy())
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """Positions of the `n_out` points of `y` kept by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; each bucket in between keeps
+    the point forming the largest triangle with the previously kept point
+    and the mean of the next bucket, so peaks and valleys survive.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    bordes = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        sig_fin = bordes[i + 2] if i + 2 < len(bordes) else n
+        x_c, y_c = (fin + sig_fin - 1) / 2, y[fin:sig_fin].mean()
+        xs = np.arange(ini, fin)
+        areas = np.abs((a - x_c) * (y[ini:fin] - y[a]) - (a - xs) * (y_c - y[a]))
+        a = ini + int(areas.argmax())
+        indices[i + 1] = a
+    return indices
+
+def number_config(df: pd.DataFrame) -> dict:
+    """column_config formatting float columns to 2 decimals in the browser."""
+    return {col: st.column_config.NumberColumn(format="%.2f")
+            for col in df.select_dtypes("float").columns}
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def to_csv_bytes(scenario_sig: str, name: str, _df: pd.DataFrame) -> bytes:
+    """CSV encoding of result table `name`, written once per scenario with pyarrow."""
+    sink = pa.BufferOutputStream()
+    pv.write_csv(pa.Table.from_pandas(_df, preserve_index=False), sink)
+    return sink.getvalue().to_pybytes()
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def to_parquet_bytes(scenario_sig: str, name: str, _df: pd.DataFrame) -> bytes:
+    """Parquet (zstd) encoding of result table `name`, written once per scenario."""
+    sink = pa.BufferOutputStream()
+    pq.write_table(pa.Table.from_pandas(_df, preserve_index=False), sink,
+                   compression='zstd', compression_level=3)
+    return sink.getvalue().to_pybytes()
+
+def write_excel(sheets: Dict[str, pd.DataFrame]) -> bytes:
+    """Excel workbook with one sheet per table.
+
+    Used as a deferred download: it only runs when the button is clicked.
+    Streamlit keeps the returned bytes in memory to serve them, so the
+    workbook is built in a BytesIO. With xlsxwriter the rows are written in
+    order in constant_memory mode, converted to Python objects
+    EXCEL_CHUNK_ROWS at a time: for a one-year run (44k-row Bodega sheet)
+    this takes 1.8 s against 3.7 s for DataFrame.to_excel, and the object
+    copy never holds more than one chunk.
+    """
+    buffer = io.BytesIO()
+    if not HAS_XLSXWRITER:
+        with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+            for name, df in sheets.items():
+                df.to_excel(writer, sheet_name=name, index=False)
+        return buffer.getvalue()
+
+    workbook = xlsxwriter.Workbook(buffer, {
+        'constant_memory': True,
+        'strings_to_urls': False,
+        'default_date_format': 'yyyy-mm-dd hh:mm:ss',
+    })
+    header = workbook.add_format({'bold': True, 'border': 1})
+    for name, df in sheets.items():
+        ws = workbook.add_worksheet(name)
+        ws.write_row(0, 0, [str(c) for c in df.columns], header)
+        for start in range(0, len(df), EXCEL_CHUNK_ROWS):
+            chunk = df.iloc[start:start + EXCEL_CHUNK_ROWS]
+            # celdas vacías para NaN/NaT, como en DataFrame.to_excel
+            rows = chunk.astype(object).where(chunk.notna(), None).itertuples(index=False, name=None)
+            for r, row in enumerate(rows, start=start + 1):
+                ws.write_row(r, 0, row)
+    workbook.close()
+    return buffer.getvalue()
+
+# -----------------------------------------------------------------------------
+# Resultados
+# -----------------------------------------------------------------------------
+@st.fragment
+def render_results(results: dict) -> None:
+    """Render the KPIs, analysis tabs and exports of a simulation run.
+
+    Runs as a fragment, so widgets inside it (table pages, downloads) rerun
+    only this block instead of the whole script.
+    """
+    df_buques = results['df_buques']
+    df_cola = results['df_cola']
+    df_bodega = results['df_bodega']
+    real_data_stats = results['real_data_stats']
+    params = results['params']
+    scenario_sig = results['scenario_sig']
+
+
+    st.header("📊 Resultados de la Simulación")
+    # Tiempos en días como ndarray, compartidos por los histogramas
+    espera_dias = df_buques["Tiempo de espera (dias)"].to_numpy(dtype=np.float32)
+    descarga_dias = df_buques["Tiempo descarga (dias)"].to_numpy(dtype=np.float32)
+    kpis, (p50_espera, p90_espera, p95_espera) = result_kpis(scenario_sig, df_buques, df_cola)
+    bodega = bodega_kpis(scenario_sig, df_bodega) if df_bodega is not None else None
+
+    metric_grid({label: format_kpi(label, value) for label, value in kpis.items()})
+
+
+    if df_bodega is not None:
+        st.subheader("📦 Métricas de Bodega")
+        metric_grid({
+            "Inventario final (toneladas)": f"{bodega['Inventario final (toneladas)']:,.0f}",
+            "Movimientos totales": f"{bodega['Movimientos totales']:,}",
+            "Camiones a bodega": f"{params['camiones_dedicados']}",
+        })
+
+    st.header("📈 Análisis")
+    # on_change="rerun": solo se arma el contenido de la pestaña seleccionada
+    tab_summary, tab_charts, tab_data, tab_export = st.tabs(
+        ["Resultados prinicpales", " Graficos ", " Tablas de Datos", " Exportar"],
+        key="tab_resultados", on_change="rerun"
+    )
+
+    # describe() de cada tabla, compartido por la pestaña de resumen y el reporte
+    stats_buques, stats_cola = describe_results(scenario_sig, df_buques, df_cola)
+
+    with tab_summary:
+        if tab_summary.open:
+            col1, col2 = st.columns(2)
+    
+            with col1:
+                st.subheader("Estadísticas de Buques")
+                st.dataframe(
+                    stats_buques[['Tiempo de espera (dias)', 'Tiempo descarga (dias)', 
+                                  'Tonelaje buque', 'Camiones normales', 'Camiones dedicados']],
+                    use_container_width=True
+                )
+    
+            with col2:
+                st.subheader("Estadísticas de Cola")
+                st.dataframe(
+                    stats_cola[['Largo cola rada']],
+                    use_container_width=True
+                )
+    
+            st.subheader("Distribución de Tiempos")
+            metric_grid({
+                "P50 Espera": f"{p50_espera:.2f} días",
+                "P90 Espera": f"{p90_espera:.2f} días",
+                "P95 Espera": f"{p95_espera:.2f} días",
+            })
+
+    # ventana graficos
+    with tab_charts:
+        if tab_charts.open:
+    
+            st.subheader("Datos Reales vs Simulación")
+    
+            col1, col2 = st.columns(2)
+    
+            with col1:
+                # datos reales y simulados, con bins ya agregados (30 filas por gráfico)
+                if 'waiting_time_days' in real_data_stats:
+                    st.vega_lite_chart(hist_chart(real_data_stats['waiting_time_days'],
+                                                  'Tiempo de Espera - Datos Reales', "#78de84"),
+                                       use_container_width=True)
+                st.vega_lite_chart(hist_chart(espera_dias, 'Tiempo de Espera - Simulación', "#4a87d6"),
+                                   use_container_width=True)
+    
+            with col2:
+                if 'unloading_time_days' in real_data_stats:
+                    st.vega_lite_chart(hist_chart(real_data_stats['unloading_time_days'],
+                                                  'Tiempo de Descarga - Datos Reales', "#78de84"),
+                                       use_container_width=True)
+                st.vega_lite_chart(hist_chart(descarga_dias, 'Tiempo de Descarga - Simulación', "#4a87d6"),
+                                   use_container_width=True)
+    
+            st.divider()
+    
+            st.subheader("Otras Visualizaciones")
+    
+            col1, col2 = st.columns(2)
+    
+            with col1:
+                # Largo de la cola en rada a lo largo del tiempo
+                st.vega_lite_chart(cola_series(scenario_sig, df_cola), QUEUE_CHART_SPEC,
+                                   use_container_width=True)
+    
+            with col2:
+                # Scatter plot de tiempo de espera vs tiempo de descarga
+                st.vega_lite_chart(scatter_points(scenario_sig, df_buques), SCATTER_CHART_SPEC,
+                                   use_container_width=True)
+    
+   
+            if df_bodega is not None:
+                st.subheader("📦 Moviemientos en Bodega")
+        
+                # Evolucion de la bodega
+                st.vega_lite_chart(bodega_series(scenario_sig, df_bodega), BODEGA_CHART_SPEC,
+                                   use_container_width=True)
+
+    # Data Tab
+    with tab_data:
+        if tab_data.open:
+            st.subheader(" Datos de Buques")
+            st.dataframe(paged(df_buques, "page_buques"), use_container_width=True, hide_index=True,
+                         column_config=number_config(df_buques))
+    
+            st.subheader("Datos de Cola")
+            st.dataframe(paged(df_cola, "page_cola"), use_container_width=True, hide_index=True,
+                         column_config=number_config(df_cola))
+    
+            if df_bodega is not None:
+                st.subheader("Datos de Bodega")
+                st.dataframe(paged(df_bodega, "page_bodega"), use_container_width=True, hide_index=True,
+                             column_config=number_config(df_bodega))
+
+    # Export Tab
+    with tab_export:
+        if tab_export.open:
+            st.markdown("### 💾 Exportar Resultados")
+            # sello fijado al terminar la corrida: los file_name no cambian entre reruns
+            ts = results.get('export_stamp') or datetime.now().strftime('%Y%m%d_%H%M%S')
+            st.info(" Todos los archivos incluyen metadatos de la simulación y están listos para análisis posterior")
+    
+            st.subheader("Descargas Individuales")
+    
+            col1, col2, col3 = st.columns(3)
+    
+            with col1:
+                csv_buques = to_csv_bytes(scenario_sig, "buques", df_buques)
+                st.download_button(
+                    label="📥 Descargar Datos de Buques (CSV)",
+                    data=csv_buques,
+                    file_name=f"buques_simulacion_{ts}.csv",
+                    mime="text/csv"
+                )
+    
+            with col2:
+                csv_cola = to_csv_bytes(scenario_sig, "cola", df_cola)
+                st.download_button(
+                    label="📥 Descargar Datos de Cola (CSV)",
+                    data=csv_cola,
+                    file_name=f"cola_simulacion_{ts}.csv",
+                    mime="text/csv"
+                )
+    
+            with col3:
+                if df_bodega is not None:
+                    csv_bodega = to_csv_bytes(scenario_sig, "bodega", df_bodega)
+                    st.download_button(
+                        label="📥 Descargar Datos de Bodega (CSV)",
+                        data=csv_bodega,
+                        file_name=f"bodega_simulacion_{ts}.csv",
+                        mime="text/csv"
+                    )
+    
+            # Parquet: bastante más liviano que CSV en corridas de varios años
+            col1, col2, col3 = st.columns(3)
+            tablas = [("buques", "Buques", df_buques), ("cola", "Cola", df_cola), ("bodega", "Bodega", df_bodega)]
+            for col, (name, label, df) in zip((col1, col2, col3), tablas):
+                if df is None:
+                    continue
+                with col:
+                    st.download_button(
+                        label=f"📥 Descargar Datos de {label} (Parquet)",
+                        data=to_parquet_bytes(scenario_sig, name, df),
+                        file_name=f"{name}_simulacion_{ts}.parquet",
+                        mime="application/vnd.apache.parquet"
+                    )
+    
+            # Generate and download summary report
+            st.subheader("Resumen")
+            # el reporte se arma recién al hacer clic, como el Excel
+            st.download_button(
+                label="📥 Descargar Reporte Completo (TXT)",
+                data=partial(generate_summary_report, kpis, stats_buques, stats_cola, bodega, params),
+                file_name=f"reporte_simulacion_{ts}.txt",
+                mime="text/plain"
+            )
+    
+            # Export all data as Excel
+            st.subheader(" Exportar Todo a Excel")
+            sheets = {'Buques': df_buques, 'Cola': df_cola}
+            if df_bodega is not None:
+                sheets['Bodega'] = df_bodega
+            # Add parameters sheet
+            sheets['Parametros'] = pd.DataFrame([params])
+            st.download_button(
+                label="📥 Descargar Todo en Excel",
+                data=partial(write_excel, sheets),
+                file_name=f"simulacion_completa_{ts}.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
+
+
 # -----------------------------------------------------------------------------
 # Selección de pagina
 # -----------------------------------------------------------------------------
@@ -372,7 +1183,7 @@ if page == "📖 Guía de Usuario":
     with col1:
         st.write("1.")
     with col2:
-        st.write("**Preparación de Datos**  \nAsegúrese de tener los archivos históricos en formato CSV o Excel")
+        st.write("**Preparación de Datos**  \nAsegúrese de tener los archivos históricos en formato CSV, Parquet o Excel")
     
     col1, col2 = st.columns([1, 20])
     with col1:
@@ -403,7 +1214,7 @@ if page == "📖 Guía de Usuario":
     
     # Trucks file format
     with st.expander("**Archivo de Camiones** - Ver formato requerido", expanded=True):
-        camiones_df = pd.DataFrame({
+        camiones_df = pa.table({
             'Columna': ['año', 'turno', 'min_entre_camiones', 'capacidad'],
             'Descripción': [
                 'Año del registro', 
@@ -417,7 +1228,7 @@ if page == "📖 Guía de Usuario":
     
     # Ships file format
     with st.expander("**Archivo de Buques** - Ver formato requerido", expanded=True):
-        buques_df = pd.DataFrame({
+        buques_df = pa.table({
             'Columna': [
                 'tiempo_descarga', 
                 'tiempo_entre_arribos', 
@@ -526,44 +1337,46 @@ else:
         # subir archivos
         cam_file = st.file_uploader(
             "Archivo de Camiones",
-            type=["csv", "xlsx", "xls"],
+            type=["csv", "parquet", "xlsx", "xls"],
             help="Debe contener: año, turno, min_entre_camiones, capacidad"
         )
         
         buq_file = st.file_uploader(
             "Archivo de Buques",
-            type=["csv", "xlsx", "xls"],
+            type=["csv", "parquet", "xlsx", "xls"],
             help="Debe contener las columnas requeridas de operación"
         )
         
-        # Validar datos
-        cam_df: Optional[pd.DataFrame] = None
-        buq_df: Optional[pd.DataFrame] = None
+        # Validar datos: solo con las primeras filas, el archivo completo se lee al simular
+        cam_sig: Optional[str] = None
+        buq_sig: Optional[str] = None
         data_valid = False
         
         if cam_file:
-            cam_df = load_file(cam_file)
-            if cam_df is not None:
-                valid, missing = validate_dataframe(cam_df, REQUIRED_CAMIONES_COLS, "Camiones")
+            cam_sig = file_signature(cam_file)
+            cam_head = load_preview(cam_sig, cam_file, REQUIRED_CAMIONES_COLS)
+            if cam_head is not None:
+                valid, missing = validate_dataframe(cam_head, REQUIRED_CAMIONES_COLS, "Camiones")
                 if valid:
                     st.success("✅ Archivo de camiones validado correctamente")
                     with st.expander("👁️ Vista previa - Camiones", expanded=False):
-                        st.dataframe(cam_df.head(), use_container_width=True)
-                        st.caption(f"Mostrando primeras 5 filas de {len(cam_df):,} registros totales")
+                        st.dataframe(preview_table(cam_sig, cam_head), use_container_width=True)
+                        st.caption("Mostrando primeras 5 filas del archivo")
                     data_valid = True
                 else:
                     st.error(f"❌ Faltan columnas en camiones: {', '.join(missing)}")
                     data_valid = False
         
         if buq_file:
-            buq_df = load_file(buq_file)
-            if buq_df is not None:
-                valid, missing = validate_dataframe(buq_df, REQUIRED_BUQUES_COLS, "Buques")
+            buq_sig = file_signature(buq_file)
+            buq_head = load_preview(buq_sig, buq_file, REQUIRED_BUQUES_COLS + OPTIONAL_BUQUES_COLS)
+            if buq_head is not None:
+                valid, missing = validate_dataframe(buq_head, REQUIRED_BUQUES_COLS, "Buques")
                 if valid:
                     st.success("✅ Archivo de buques validado correctamente")
                     with st.expander("👁️ Vista previa - Buques", expanded=False):
-                        st.dataframe(buq_df.head(), use_container_width=True)
-                        st.caption(f"Mostrando primeras 5 filas de {len(buq_df):,} registros totales")
+                        st.dataframe(preview_table(buq_sig, buq_head), use_container_width=True)
+                        st.caption("Mostrando primeras 5 filas del archivo")
                 else:
                     st.error(f"❌ Faltan columnas en buques: {', '.join(missing)}")
                     data_valid = False
@@ -670,7 +1483,8 @@ else:
                     "Tiempo cargar bascula ",
                     min_value=1.0,
                     max_value=20.0,
-                    value=7.0,
+                    # por defecto el tiempo de carga en chute del núcleo (7.28)
+                    value=clases_sim_core.TIEMPO_CARGAR_EN_CHUTE,
                     step=0.5,
                     help="Minutos que tarda en cargar camion en bascula"
                 )
@@ -790,56 +1604,51 @@ else:
 
             try:
                 progress_bar.progress(20, text="Cargando datos históricos...")
-                time.sleep(0.5)
-                clases_sim.load_data(cam_df, buq_df)
+                cam_df = load_file(cam_sig, cam_file, REQUIRED_CAMIONES_COLS)
+                buq_df = load_file(buq_sig, buq_file, REQUIRED_BUQUES_COLS + OPTIONAL_BUQUES_COLS)
+                if cam_df is None or buq_df is None:
+                    raise ValueError("No se pudieron leer los archivos de entrada")
                 progress_bar.progress(40, text="Configurando parámetros...")
-                time.sleep(0.5)
+                parametros = clases_sim_core.ParametrosOperacion(
+                    tiempo_puerta_entrada=tiempo_puerta_entrada,
+                    tiempo_puerta_salida=tiempo_puerta_salida,
+                    tiempo_entrada_camion_dedicado=tiempo_puerta_entrada,
+                    tiempo_cargar_en_chute=tiempo_cargar_bascula,
+                    tiempo_a_bodega=tiempo_a_bodega,
+                    tiempo_descargar_en_bodega=tiempo_descargar_bodega,
+                    tiempo_cargar_en_bodega=tiempo_cargar_bodega,
+                    tiempo_salida_de_bodega=tiempo_salida_bodega,
+                    tiempo_atraque=tiempo_atraque,
+                    tiempo_llegada_camiones=tiempo_llegada_camiones,
+                    maximo_rada=int(max_rada),
+                    tiempo_espiarse=tiempo_espiarse
+                )
+
+                scenario = Scenario(
+                    años=años,
+                    camiones_dedicados=cam_dedic,
+                    grano=grano_ini if cam_dedic > 0 else 0,
+                    cap=cap_cam_dedic if cam_dedic > 0 else 0,
+                    prob=prob_bodega,
+                    buques_inicio_cola=buques_init,
+                    seed=int(semilla)
+                )
                 progress_bar.progress(60, text="Ejecutando simulación...")
-                time_params = {
-                    'TIEMPO_PUERTA_ENTRADA': tiempo_puerta_entrada,
-                    'TIEMPO_PUERTA_SALIDA': tiempo_puerta_salida,
-                    'TIEMPO_ENTRADA_CAMION_DEDICADO': tiempo_puerta_entrada,
-                    'TIEMPO_CARGAR_EN_BASCULA': tiempo_cargar_bascula,
-                    'TIEMPO_A_BODEGA': tiempo_a_bodega,
-                    'TIEMPO_DESCARGAR_EN_BODEGA': tiempo_descargar_bodega,
-                    'TIEMPO_CARGAR_EN_BODEGA': tiempo_cargar_bodega,
-                    'TIEMPO_SALIDA_DE_BODEGA': tiempo_salida_bodega,
-                    'TIEMPO_ATRAQUE': tiempo_atraque,
-                    'TIEMPO_LLEGADA_CAMIONES': tiempo_llegada_camiones,
-                    'TASA_LLEGADA_FACTOR': 1.08,
-                    'MAXIMO_RADA': int(max_rada),
-                    'TIEMPO_ESPIARSE': tiempo_espiarse
-                }
-                
-                # Definicion de los parametros en el script clases_sim module
-                for param, value in time_params.items():
-                    setattr(clases_sim, param, value)
-                
-                if cam_dedic > 0:
-                    df_buques, df_cola, df_bodega = clases_sim.simulacion(
-                        años=años,
-                        camiones_dedicados=cam_dedic,
-                        grano=grano_ini,
-                        cap=cap_cam_dedic,
-                        prob=prob_bodega,
-                        buques_inicio_cola=buques_init,
-                        seed=int(semilla)
+                with cProfile.Profile() if PROFILE_RUNS else contextlib.nullcontext() as profiler:
+                    df_buques, df_cola, df_bodega = run_cached(
+                        cam_sig, buq_sig, scenario,
+                        parametros=parametros,
+                        _cam_df=cam_df,
+                        _buq_df=buq_df,
+                        # el avance del reloj simulado ocupa el tramo 60-90 de la barra
+                        _progress_cb=lambda avance, mensaje: progress_bar.progress(
+                            60 + int(30*avance), text=mensaje)
                     )
-                else:
-                    results = clases_sim.simulacion(
-                        años=años,
-                        camiones_dedicados=0,
-                        grano=0,
-                        cap=0,
-                        prob=prob_bodega,
-                        buques_inicio_cola=buques_init,
-                        seed=int(semilla)
-                    )
-                    df_buques, df_cola = results
-                    df_bodega = None
+                if PROFILE_RUNS:
+                    profiler.dump_stats(PROFILE_PATH)
+                    st.caption(f"Perfil de la corrida guardado en {PROFILE_PATH.name}")
                 
                 progress_bar.progress(90, text="Procesando resultados...")
-                time.sleep(0.5)
                 
                
                 execution_time = time.time() - start_time
@@ -847,37 +1656,39 @@ else:
                 real_data_stats = calculate_real_data_statistics(buq_df)
                 
                 # Guardar resultados de la sesion
+                params = {
+                    'años': años,
+                    'camiones_dedicados': cam_dedic,
+                    'capacidad_dedicados': cap_cam_dedic,
+                    'grano_inicial': grano_ini,
+                    'prob_bodega': prob_bodega,
+                    'buques_inicial': buques_init,
+                    'semilla': semilla,
+                    'tiempo_puerta_entrada': tiempo_puerta_entrada,
+                    'tiempo_puerta_salida': tiempo_puerta_salida,
+                    'tiempo_cargar_bascula': tiempo_cargar_bascula,
+                    'tiempo_a_bodega': tiempo_a_bodega,
+                    'tiempo_descargar_bodega': tiempo_descargar_bodega,
+                    'tiempo_cargar_bodega': tiempo_cargar_bodega,
+                    'tiempo_salida_bodega': tiempo_salida_bodega,
+                    'tiempo_atraque': tiempo_atraque,
+                    'tiempo_llegada_camiones': tiempo_llegada_camiones,
+                    'tasa_llegada_factor': 1.08,
+                    'max_rada': int(max_rada),
+                    'tiempo_espiarse': tiempo_espiarse
+                }
                 st.session_state.simulation_results = {
                     'df_buques': df_buques,
                     'df_cola': df_cola,
                     'df_bodega': df_bodega,
                     'real_data_stats': real_data_stats,
                     'execution_time': execution_time,
-                    'params': {
-                        'años': años,
-                        'camiones_dedicados': cam_dedic,
-                        'capacidad_dedicados': cap_cam_dedic,
-                        'grano_inicial': grano_ini,
-                        'prob_bodega': prob_bodega,
-                        'buques_inicial': buques_init,
-                        'semilla': semilla,
-                        'tiempo_puerta_entrada': tiempo_puerta_entrada,
-                        'tiempo_puerta_salida': tiempo_puerta_salida,
-                        'tiempo_cargar_bascula': tiempo_cargar_bascula,
-                        'tiempo_a_bodega': tiempo_a_bodega,
-                        'tiempo_descargar_bodega': tiempo_descargar_bodega,
-                        'tiempo_cargar_bodega': tiempo_cargar_bodega,
-                        'tiempo_salida_bodega': tiempo_salida_bodega,
-                        'tiempo_atraque': tiempo_atraque,
-                        'tiempo_llegada_camiones': tiempo_llegada_camiones,
-                        'tasa_llegada_factor': 1.08,
-                        'max_rada': int(max_rada),
-                        'tiempo_espiarse': tiempo_espiarse
-                    }
+                    'params': params,
+                    'scenario_sig': scenario_signature(cam_sig, buq_sig, params),
+                    'export_stamp': datetime.now().strftime('%Y%m%d_%H%M%S')
                 }
                 
                 progress_bar.progress(100, text="✅ Simulación completada")
-                time.sleep(0.5)
                 progress_bar.empty()
                 
                 st.balloons()
@@ -894,321 +1705,7 @@ else:
 
     # Mostrar resultados 
     if st.session_state.simulation_results:
-        results = st.session_state.simulation_results
-        df_buques = results['df_buques']
-        df_cola = results['df_cola']
-        df_bodega = results['df_bodega']
-        real_data_stats = results['real_data_stats']
-        params = results['params']
-        
-       
-        st.header("📊 Resultados de la Simulación")
-        kpis = {
-            "Buques atendidos": len(df_buques),
-            "Tiempo espera promedio (días)": df_buques["Tiempo de espera (dias)"].mean(),
-            "Tiempo descarga promedio (días)": df_buques["Tiempo descarga (dias)"].mean(),
-            "Largo cola promedio": df_cola["Largo cola rada"].mean(),
-        }
-        
-        if 'total buques perdidos' in df_cola.columns:
-            kpis["Buques perdidos"] = df_cola["total buques perdidos"].max()
-        
-        cols = st.columns(len(kpis))
-        for col, (label, value) in zip(cols, kpis.items()):
-            with col:
-                create_metric_card(label, value)
-        
-
-        if df_bodega is not None:
-            st.subheader("📦 Métricas de Bodega")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("Inventario final (toneladas)", f"{df_bodega['ton restante bodega'].iloc[-1]:,.0f}")
-            with col2:
-                st.metric("Movimientos totales", f"{len(df_bodega):,}")
-            with col3:
-                st.metric("Camiones a bodega", f"{params['camiones_dedicados']}")
-        
-        st.header("📈 Análisis")
-        tab_summary, tab_charts, tab_data, tab_export = st.tabs(
-            ["Resultados prinicpales", " Graficos ", " Tablas de Datos", " Exportar"]
-        )
-        
-        with tab_summary:
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                st.subheader("Estadísticas de Buques")
-                st.dataframe(
-                    df_buques[['Tiempo de espera (dias)', 'Tiempo descarga (dias)', 
-                              'Tonelaje buque', 'Camiones normales', 'Camiones dedicados']].describe(),
-                    use_container_width=True
-                )
-            
-            with col2:
-                st.subheader("Estadísticas de Cola")
-                st.dataframe(
-                    df_cola[['Largo cola rada']].describe(),
-                    use_container_width=True
-                )
-            
-            st.subheader("Distribución de Tiempos")
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                st.metric("P50 Espera", f"{df_buques['Tiempo de espera (dias)'].quantile(0.5):.2f} días")
-            with col2:
-                st.metric("P90 Espera", f"{df_buques['Tiempo de espera (dias)'].quantile(0.9):.2f} días")
-            with col3:
-                st.metric("P95 Espera", f"{df_buques['Tiempo de espera (dias)'].quantile(0.95):.2f} días")
-        
-        # ventana graficos
-        with tab_charts:
-            
-            st.subheader("Datos Reales vs Simulación")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-                sns.set_style("whitegrid")
-                
-                # datos reales histogramas
-                if 'waiting_time_days' in real_data_stats:
-                    sns.histplot(data=real_data_stats['waiting_time_days'], 
-                                bins=30, kde=True, color="#78de84", alpha=0.7, ax=ax1)
-                    ax1.set_title('Tiempo de Espera - Datos Reales', fontsize=14, fontweight='bold')
-                    ax1.set_xlabel('Días', fontsize=12)
-                    ax1.set_ylabel('Frecuencia', fontsize=12)
-                    ax1.grid(True, alpha=0.3, linestyle='--')
-                    
-              
-                
-                #  datos simulados histogramas
-                sns.histplot(data=df_buques, x='Tiempo de espera (dias)', 
-                            bins=30, kde=True, color="#4a87d6", alpha=0.7, ax=ax2)
-                ax2.set_title('Tiempo de Espera - Simulación', fontsize=14, fontweight='bold')
-                ax2.set_xlabel('Días', fontsize=12)
-                ax2.set_ylabel('Frecuencia', fontsize=12)
-                ax2.grid(True, alpha=0.3, linestyle='--')        
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-            with col2:
-                fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-                
-                # datos reales histogramas
-                if 'unloading_time_days' in real_data_stats:
-                    sns.histplot(data=real_data_stats['unloading_time_days'], 
-                                bins=30, kde=True, color="#78de84", alpha=0.7, ax=ax1)
-                    ax1.set_title('Tiempo de Descarga - Datos Reales', fontsize=14, fontweight='bold')
-                    ax1.set_xlabel('Días', fontsize=12)
-                    ax1.set_ylabel('Frecuencia', fontsize=12)
-                    ax1.grid(True, alpha=0.3, linestyle='--')
-                    
-                   
-                # datos simulados histogramas
-                sns.histplot(data=df_buques, x='Tiempo descarga (dias)', 
-                            bins=30, kde=True, color="#4a87d6", alpha=0.7, ax=ax2)
-                ax2.set_title('Tiempo de Descarga - Simulación', fontsize=14, fontweight='bold')
-                ax2.set_xlabel('Días', fontsize=12)
-                ax2.set_ylabel('Frecuencia', fontsize=12)
-                ax2.grid(True, alpha=0.3, linestyle='--')
-                               
-                plt.tight_layout()
-                st.pyplot(fig)
-            
-           
-            
-            st.divider()
-            
-            st.subheader("Otras Visualizaciones")
-            
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                # Largo de la cola en rada a lo largo del tiempo
-                chart = alt.Chart(df_cola).mark_line(
-                    strokeWidth=3,
-                    color='#1a73e8',
-                    point=alt.OverlayMarkDef(
-                        filled=True, 
-                        fill="#1a73e8",
-                        size=80
-                    )
-                ).encode(
-                    x=alt.X('Dia:Q', title='Día de Simulación'),
-                    y=alt.Y('Largo cola rada:Q', title='Número de Buques en Cola'),
-                    tooltip=[
-                        alt.Tooltip('Dia:Q', title='Día'),
-                        alt.Tooltip('Largo cola rada:Q', title='Buques en cola')
-                    ]
-                ).properties(
-                    title={
-                        "text": 'Evolución de la Cola en Rada',
-                        "fontSize": 16,
-                        "fontWeight": "bold"
-                    },
-                    width=600,
-                    height=400
-                ).configure_axis(
-                    labelFontSize=12,
-                    titleFontSize=14
-                ).interactive()
-                st.altair_chart(chart, use_container_width=True)
-            
-            with col2:
-                # Scatter plot de tiempo de espera vs tiempo de descarga
-                scatter = alt.Chart(df_buques).mark_circle(size=100, opacity=0.8).encode(
-                    x=alt.X('Tiempo de espera (dias):Q', 
-                           title='Tiempo de espera (días)',
-                           scale=alt.Scale(zero=False)),
-                    y=alt.Y('Tiempo descarga (dias):Q', 
-                           title='Tiempo de descarga (días)',
-                           scale=alt.Scale(zero=False)),
-                    size=alt.Size('Tonelaje buque:Q', 
-                                 title='Tonelaje',
-                                 scale=alt.Scale(range=[100, 400])),
-                    color=alt.Color('Largo cola al arribo:Q', 
-                                   scale=alt.Scale(scheme='viridis'),
-                                   title='Cola al arribo'),
-                    tooltip=[
-                        alt.Tooltip('BuqueID:N', title='ID Buque'),
-                        alt.Tooltip('Tonelaje buque:Q', title='Tonelaje', format=',.0f'),
-                        alt.Tooltip('Tiempo de espera (dias):Q', title='Espera (días)', format='.2f'),
-                        alt.Tooltip('Tiempo descarga (dias):Q', title='Descarga (días)', format='.2f'),
-                        alt.Tooltip('Largo cola al arribo:Q', title='Cola al arribo')
-                    ]
-                ).properties(
-                    title={
-                        "text": 'Espera vs Descarga',
-                        "fontSize": 16,
-                        "fontWeight": "bold"
-                    },
-                    width=600,
-                    height=400
-                ).configure_axis(
-                    labelFontSize=12,
-                    titleFontSize=14
-                ).interactive()
-                st.altair_chart(scatter, use_container_width=True)
-            
-           
-            if df_bodega is not None:
-                st.subheader("📦 Moviemientos en Bodega")
-                
-                # Evolucion de la bodega
-                bodega_chart = alt.Chart(df_bodega.reset_index()).mark_area(
-                    line={'color':'#ea4335', 'strokeWidth': 3},
-                    color=alt.Gradient(
-                        gradient='linear',
-                        stops=[
-                            alt.GradientStop(color='#ea4335', offset=0),
-                            alt.GradientStop(color='#fbbc04', offset=1)
-                        ],
-                        x1=1, x2=1, y1=1, y2=0
-                    ),
-                    opacity=0.6
-                ).encode(
-                    x=alt.X('index:Q', title='Número de Movimiento'),
-                    y=alt.Y('ton restante bodega:Q', title='Toneladas en Bodega'),
-                    tooltip=[
-                        alt.Tooltip('index:Q', title='Movimiento #'),
-                        alt.Tooltip('ton restante bodega:Q', title='Toneladas', format=',.0f'),
-                        alt.Tooltip('actividad camion :N', title='Actividad')
-                    ]
-                ).properties(
-                    title={
-                        "text": 'Evolución del Inventario en Bodega',
-                        "fontSize": 16,
-                        "fontWeight": "bold"
-                    },
-                    width=800,
-                    height=400
-                ).configure_axis(
-                    labelFontSize=12,
-                    titleFontSize=14
-                ).interactive()
-                st.altair_chart(bodega_chart, use_container_width=True)
-        
-        # Data Tab
-        with tab_data:
-            st.subheader(" Datos de Buques")
-            st.dataframe(df_buques, use_container_width=True)
-            
-            st.subheader("Datos de Cola")
-            st.dataframe(df_cola, use_container_width=True)
-            
-            if df_bodega is not None:
-                st.subheader("Datos de Bodega")
-                st.dataframe(df_bodega, use_container_width=True)
-        
-        # Export Tab
-        with tab_export:
-            st.markdown("### 💾 Exportar Resultados")
-            st.info(" Todos los archivos incluyen metadatos de la simulación y están listos para análisis posterior")
-            
-            st.subheader("Descargas Individuales")
-            
-            col1, col2, col3 = st.columns(3)
-            
-            with col1:
-                csv_buques = df_buques.to_csv(index=False)
-                st.download_button(
-                    label="📥 Descargar Datos de Buques (CSV)",
-                    data=csv_buques,
-                    file_name=f"buques_simulacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            
-            with col2:
-                csv_cola = df_cola.to_csv(index=False)
-                st.download_button(
-                    label="📥 Descargar Datos de Cola (CSV)",
-                    data=csv_cola,
-                    file_name=f"cola_simulacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-            
-            with col3:
-                if df_bodega is not None:
-                    csv_bodega = df_bodega.to_csv(index=False)
-                    st.download_button(
-                        label="📥 Descargar Datos de Bodega (CSV)",
-                        data=csv_bodega,
-                        file_name=f"bodega_simulacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                        mime="text/csv"
-                    )
-            
-            # Generate and download summary report
-            st.subheader("Resumen")
-            report = generate_summary_report(df_buques, df_cola, df_bodega, params)
-            st.download_button(
-                label="📥 Descargar Reporte Completo (TXT)",
-                data=report,
-                file_name=f"reporte_simulacion_{datetime.now().strftime('%Y%m%d_%H%M%S')}.txt",
-                mime="text/plain"
-            )
-            
-            # Export all data as Excel
-            st.subheader(" Exportar Todo a Excel")
-            buffer = io.BytesIO()
-            with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
-                df_buques.to_excel(writer, sheet_name='Buques', index=False)
-                df_cola.to_excel(writer, sheet_name='Cola', index=False)
-                if df_bodega is not None:
-                    df_bodega.to_excel(writer, sheet_name='Bodega', index=False)
-                
-                # Add parameters sheet
-                params_df = pd.DataFrame([params])
-                params_df.to_excel(writer, sheet_name='Parametros', index=False)
-            
-            excel_data = buffer.getvalue()
-            st.download_button(
-                label="📥 Descargar Todo en Excel",
-                data=excel_data,
-                file_name=f"simulacion_completa_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        render_results(st.session_state.simulation_results)
 
     # Footer
     st.markdown("<br><br>", unsafe_allow_html=True)